@@ -7,12 +7,21 @@ This file is intentionally minimal. It only boots the Textual UI app.
 from __future__ import annotations
 
 import asyncio
+from cyberjournal.logic import close_db
 from cyberjournal.ui import CyberJournalApp
 
 
+async def _run() -> None:
+    """Run the app, then release the shared DB connection."""
+    try:
+        await CyberJournalApp().run_async()
+    finally:
+        await close_db()
+
+
 def main() -> None:
     """Run the Textual application."""
-    asyncio.run(CyberJournalApp().run_async())
+    asyncio.run(_run())
 
 
 if __name__ == "__main__":
@@ -6,16 +6,19 @@ session key container. It does **not** perform any database I/O.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+import functools
+import hashlib
 import re
 import secrets
 
 from argon2 import PasswordHasher
+from argon2.low_level import Type, hash_secret_raw
 from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives import hashes, hmac
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
 
 # ---------------------------------------------------------------------
 # Parameters
@@ -33,14 +36,32 @@ SCRYPT_N = 2 ** 14
 SCRYPT_R = 8
 SCRYPT_P = 1
 
+# KEK derivation scheme, stored per user in users.kek_version
+KDF_VERSION_SCRYPT = 1
+KDF_VERSION_ARGON2ID = 2
+KDF_VERSION_CURRENT = KDF_VERSION_ARGON2ID
+
 KEK_LEN = 32
 DEK_LEN = 32
 NONCE_LEN = 12
+# Blind-index hashes keep a 64-bit HMAC prefix; ample for one user's journal
+TERM_HASH_LEN = 8
 
 HKDF_INFO_ENC = b"cyberjournal/enc-key"
 HKDF_INFO_HMAC = b"cyberjournal/search-key"
+HKDF_INFO_MAP_CHACHA = b"cyberjournal/map-chacha-key"
+
+# Map previews sealed with ChaCha20-Poly1305 (hosts without AES instructions)
+# store this prefix on entries.map_format, e.g. "chacha20-ascii".
+MAP_FORMAT_CHACHA_PREFIX = "chacha20-"
 
 TOKEN_SPLIT_RE = re.compile(r"[\W_]+", re.UNICODE)
+# Complement of TOKEN_SPLIT_RE: findall() yields the non-empty split parts directly.
+TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+_SHA256_BLOCK = 64
+# Hash algorithm descriptors are immutable; share one instance
+_SHA256 = hashes.SHA256()
 
 
 # ---------------------------------------------------------------------
@@ -49,13 +70,46 @@ TOKEN_SPLIT_RE = re.compile(r"[\W_]+", re.UNICODE)
 
 @dataclass
 class SessionKeys:
-    """Decrypted/derived keys bound to an authenticated user session."""
+    """Decrypted/derived keys bound to an authenticated user session.
+
+    ``enc_cipher`` is an AES-GCM context keyed with ``enc_key``; it is built
+    once per session so field encryption does not repeat the key schedule.
+    ``map_chacha_cipher`` is a ChaCha20-Poly1305 context under a key derived
+    from ``enc_key``, used for map previews on hosts without AES instructions.
+    ``username_bytes`` is the UTF-8 username used as AAD on every field.
+    """
 
     user_id: int
     username: str
     dek: bytes
     enc_key: bytes
     search_key: bytes
+    enc_cipher: AESGCM = field(init=False, repr=False, compare=False)
+    map_chacha_cipher: ChaCha20Poly1305 = field(init=False, repr=False, compare=False)
+    username_bytes: bytes = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.username_bytes = self.username.encode()
+        self.enc_cipher = AESGCM(self.enc_key)
+        self.map_chacha_cipher = ChaCha20Poly1305(hkdf_derive(self.enc_key, HKDF_INFO_MAP_CHACHA, 32))
+
+
+@functools.lru_cache(maxsize=None)
+def has_aes_acceleration() -> bool:
+    """Best-effort check for AES CPU instructions (x86 AES-NI, ARMv8 AES).
+
+    Reads the CPU flags from /proc/cpuinfo; where that is unavailable the
+    answer is True so the default AES-GCM path is kept.
+    """
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8", errors="replace") as fh:
+            for line in fh:
+                key, _, value = line.partition(":")
+                if key.strip().lower() in ("flags", "features"):
+                    return "aes" in value.split()
+    except OSError:
+        pass
+    return True
 
 
 # ---------------------------------------------------------------------
@@ -67,20 +121,57 @@ def scrypt_kdf(password: str, salt: bytes, length: int = KEK_LEN) -> bytes:
     kdf = Scrypt(salt=salt, length=length, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
     return kdf.derive(password.encode("utf-8"))
 
+def argon2_kdf(password: str, salt: bytes, length: int = KEK_LEN) -> bytes:
+    """Derive a key from a password using Argon2id (same cost parameters as PH)."""
+    return hash_secret_raw(
+        secret=password.encode("utf-8"),
+        salt=salt,
+        time_cost=PH.time_cost,
+        memory_cost=PH.memory_cost,
+        parallelism=PH.parallelism,
+        hash_len=length,
+        type=Type.ID,
+    )
+
+def derive_kek(password: str, salt: bytes, version: int, length: int = KEK_LEN) -> bytes:
+    """Derive the KEK with the scheme identified by *version* (see KDF_VERSION_*)."""
+    if version == KDF_VERSION_SCRYPT:
+        return scrypt_kdf(password, salt, length)
+    if version == KDF_VERSION_ARGON2ID:
+        return argon2_kdf(password, salt, length)
+    raise ValueError(f"Unknown KDF version: {version}")
+
 def hkdf_derive(key_material: bytes, info: bytes, length: int = 32) -> bytes:
     """Derive a subkey from key material using HKDF-SHA256."""
-    hk = HKDF(algorithm=hashes.SHA256(), length=length, salt=None, info=info)
+    hk = HKDF(algorithm=_SHA256, length=length, salt=None, info=info)
     return hk.derive(key_material)
 
-def aesgcm_encrypt(key: bytes, plaintext: bytes, aad: Optional[bytes] = None) -> Tuple[bytes, bytes]:
-    """Encrypt *plaintext* with AES-GCM; return (nonce, ciphertext)."""
+def aead_encrypt(cipher: AESGCM, plaintext: bytes, aad: Optional[bytes] = None) -> Tuple[bytes, bytes]:
+    """Encrypt *plaintext* with a prepared AEAD *cipher*; return (nonce, ciphertext)."""
     nonce = secrets.token_bytes(NONCE_LEN)
-    ct = AESGCM(key).encrypt(nonce, plaintext, aad)
+    ct = cipher.encrypt(nonce, plaintext, aad)
     return nonce, ct
 
+def aead_decrypt(cipher: AESGCM, nonce: bytes, ciphertext: bytes, aad: Optional[bytes] = None) -> bytes:
+    """Decrypt *ciphertext* with a prepared AEAD *cipher*; return plaintext."""
+    return cipher.decrypt(nonce, ciphertext, aad)
+
+def aead_decrypt_many(
+    cipher: AESGCM,
+    pairs: Iterable[Tuple[bytes, bytes]],
+    aad: Optional[bytes] = None,
+) -> List[bytes]:
+    """Decrypt a batch of ``(nonce, ciphertext)`` pairs with one prepared *cipher*."""
+    decrypt = cipher.decrypt
+    return [decrypt(nonce, ct, aad) for nonce, ct in pairs]
+
+def aesgcm_encrypt(key: bytes, plaintext: bytes, aad: Optional[bytes] = None) -> Tuple[bytes, bytes]:
+    """Encrypt *plaintext* with AES-GCM under a raw *key* (one-shot paths such as DEK wrap)."""
+    return aead_encrypt(AESGCM(key), plaintext, aad)
+
 def aesgcm_decrypt(key: bytes, nonce: bytes, ciphertext: bytes, aad: Optional[bytes] = None) -> bytes:
-    """Decrypt AES-GCM *ciphertext* with *nonce*; return plaintext."""
-    return AESGCM(key).decrypt(nonce, ciphertext, aad)
+    """Decrypt AES-GCM *ciphertext* under a raw *key* (one-shot paths such as DEK unwrap)."""
+    return aead_decrypt(AESGCM(key), nonce, ciphertext, aad)
 
 
 # ---------------------------------------------------------------------
@@ -89,10 +180,36 @@ def aesgcm_decrypt(key: bytes, nonce: bytes, ciphertext: bytes, aad: Optional[by
 
 def normalize_tokens(text: str) -> List[str]:
     """Lowercase + split on non-word characters; drop empties."""
-    return [p for p in TOKEN_SPLIT_RE.split(text.lower()) if p]
+    return TOKEN_RE.findall(text.lower())
 
 def hmac_token(search_key: bytes, token: str) -> bytes:
-    """HMAC(SHA256) a token with the session's search key."""
-    h = hmac.HMAC(search_key, hashes.SHA256())
+    """HMAC(SHA256) a token with the session's search key, truncated to TERM_HASH_LEN."""
+    h = hmac.HMAC(search_key, _SHA256)
     h.update(token.encode("utf-8"))
-    return h.finalize()
+    return h.finalize()[:TERM_HASH_LEN]
+
+def hmac_tokens(search_key: bytes, tokens: Iterable[str]) -> List[bytes]:
+    """HMAC(SHA256) each distinct token; same digests as :func:`hmac_token`.
+
+    The inner/outer key pads are hashed once and the partial SHA-256 states
+    copied per token, instead of re-keying an HMAC context for every token.
+    Duplicate tokens are skipped, so output order follows first occurrence.
+    """
+    key = search_key
+    if len(key) > _SHA256_BLOCK:
+        key = hashlib.sha256(key).digest()
+    key = key.ljust(_SHA256_BLOCK, b"\0")
+    inner0 = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+    outer0 = hashlib.sha256(bytes(b ^ 0x5C for b in key))
+    out: List[bytes] = []
+    seen = set()
+    for t in tokens:
+        if t in seen:
+            continue
+        seen.add(t)
+        inner = inner0.copy()
+        inner.update(t.encode("utf-8"))
+        outer = outer0.copy()
+        outer.update(inner.digest())
+        out.append(outer.digest()[:TERM_HASH_LEN])
+    return out
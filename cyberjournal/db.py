@@ -4,36 +4,100 @@
 from __future__ import annotations
 
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, List, Sequence, Tuple, Optional
+from typing import AsyncIterator, Iterable, List, Sequence, Tuple, Optional
+import asyncio
 import os
+import sqlite3
 import aiosqlite
 
+from .crypto import TERM_HASH_LEN
 from .errors import DatabaseError, DuplicateUserError, EntryNotFoundError
 
 DB_PATH = os.environ.get("CYBERJOURNAL_DB", "journal_encrypted.sqlite3")
 
+# Per-connection tuning; WAL makes synchronous=NORMAL crash-safe.
+CONNECTION_PRAGMAS = """
+PRAGMA foreign_keys = ON;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-20000;
+PRAGMA mmap_size=268435456;
+PRAGMA wal_autocheckpoint=1000;
+"""
+
+# Bumped by migrate_db via PRAGMA user_version for data (not DDL) migrations.
+# 1: term/tag hashes truncated to TERM_HASH_LEN bytes.
+SCHEMA_VERSION = 1
+
+# sqlite3 prepared-statement cache; queries are kept verbatim so repeats hit it.
+STATEMENT_CACHE_SIZE = 256
+
+# Shared connection for the app lifetime (reopened if DB_PATH changes).
+_conn: Optional[aiosqlite.Connection] = None
+_conn_path: Optional[str] = None
+_conn_lock: Optional[asyncio.Lock] = None
+
+
+async def get_conn() -> aiosqlite.Connection:
+    """Return the shared DB connection, opening it on first use."""
+    global _conn, _conn_path, _conn_lock
+    if _conn is not None and _conn_path == DB_PATH:
+        return _conn
+    path = DB_PATH
+    conn = await aiosqlite.connect(path, cached_statements=STATEMENT_CACHE_SIZE)
+    try:
+        conn.row_factory = aiosqlite.Row
+        await conn.executescript(CONNECTION_PRAGMAS)
+    except BaseException:
+        await conn.close()
+        raise
+    if _conn is not None and _conn_path == path:
+        # A concurrent first caller won the race; keep its connection
+        winner = _conn
+        await conn.close()
+        return winner
+    old, _conn, _conn_path, _conn_lock = _conn, conn, path, asyncio.Lock()
+    if old is not None:
+        await old.close()
+    return conn
+
+
+async def close_db() -> None:
+    """Close the shared DB connection if one is open."""
+    global _conn, _conn_path, _conn_lock
+    conn, _conn, _conn_path, _conn_lock = _conn, None, None, None
+    if conn is not None:
+        await conn.close()
+
 
 @asynccontextmanager
 async def _connect() -> AsyncIterator[aiosqlite.Connection]:
-    """Open a DB connection with foreign keys enabled."""
-    async with aiosqlite.connect(DB_PATH) as conn:
-        await conn.execute("PRAGMA foreign_keys = ON")
-        yield conn
+    """Yield the shared connection; one caller at a time, rolled back on error."""
+    conn = await get_conn()
+    lock = _conn_lock
+    async with lock:
+        try:
+            yield conn
+        except BaseException:
+            await conn.rollback()
+            raise
 
 
 # ---------------------------------------------------------------------
 # Base schema (new installs)
 # ---------------------------------------------------------------------
 
+# journal_mode is persistent in the file, so it is set here once; every
+# other PRAGMA is per connection and lives in CONNECTION_PRAGMAS.
 SCHEMA_SQL = """
 PRAGMA journal_mode=WAL;
-PRAGMA foreign_keys = ON;
 
 CREATE TABLE IF NOT EXISTS users (
     id                    INTEGER PRIMARY KEY AUTOINCREMENT,
     username              TEXT UNIQUE NOT NULL,
     pwd_hash              TEXT NOT NULL,
     kek_salt              BLOB NOT NULL,
+    kek_version           INTEGER NOT NULL DEFAULT 1,
     dek_wrapped           BLOB NOT NULL,
     dek_wrap_nonce        BLOB NOT NULL,
     security_question     TEXT NOT NULL DEFAULT '',
@@ -58,7 +122,8 @@ CREATE TABLE IF NOT EXISTS entries (
     user_id         INTEGER NOT NULL,
     created_at      TEXT NOT NULL,
 
-    -- Encrypted title
+    -- Encrypted title (sealed apart from the body so list views
+    -- can decrypt titles without fetching or decrypting bodies)
     title_nonce     BLOB NOT NULL,
     title_ct        BLOB NOT NULL,
 
@@ -89,15 +154,15 @@ CREATE TABLE IF NOT EXISTS entries (
 );
 
 CREATE TABLE IF NOT EXISTS entry_terms (
-    entry_id        INTEGER NOT NULL,
     term_hash       BLOB NOT NULL,
-    UNIQUE(entry_id, term_hash),
+    entry_id        INTEGER NOT NULL,
+    PRIMARY KEY (term_hash, entry_id),
     FOREIGN KEY (entry_id) REFERENCES entries(id) ON DELETE CASCADE
-);
+) WITHOUT ROWID;
 
-CREATE INDEX IF NOT EXISTS idx_terms_hash ON entry_terms(term_hash);
 CREATE INDEX IF NOT EXISTS idx_terms_entry ON entry_terms(entry_id);
-CREATE INDEX IF NOT EXISTS idx_entries_user ON entries(user_id);
+CREATE INDEX IF NOT EXISTS idx_entries_user_created
+  ON entries(user_id, created_at DESC);
 
 -- Encrypted tags with blind-index hash (Phase 2.3)
 CREATE TABLE IF NOT EXISTS entry_tags (
@@ -149,16 +214,23 @@ CREATE INDEX IF NOT EXISTS idx_drafts_user ON drafts(user_id);
 # Migrations (existing installs)
 # ---------------------------------------------------------------------
 
-async def _column_exists(db: aiosqlite.Connection, table: str, column: str) -> bool:
-    """Return True if `column` is present in `table`."""
-    cur = await db.execute(f"PRAGMA table_info({table})")
+PRAGMA_TABLE_INFO_USERS = "PRAGMA table_info(users)"
+PRAGMA_TABLE_INFO_ENTRIES = "PRAGMA table_info(entries)"
+_TABLE_INFO_SQL = {"users": PRAGMA_TABLE_INFO_USERS, "entries": PRAGMA_TABLE_INFO_ENTRIES}
+
+
+async def _table_columns(db: aiosqlite.Connection, table: str) -> set:
+    """Return the set of column names in `table` (one PRAGMA round-trip)."""
+    cur = await db.execute(_TABLE_INFO_SQL.get(table) or f"PRAGMA table_info({table})")
     rows = await cur.fetchall()
     await cur.close()
-    for r in rows:
-        # PRAGMA table_info columns: cid, name, type, notnull, default_value, pk
-        if len(r) >= 2 and (r[1] == column or (hasattr(r, "keys") and r["name"] == column)):
-            return True
-    return False
+    # PRAGMA table_info columns: cid, name, type, notnull, default_value, pk
+    return {r[1] for r in rows}
+
+
+async def _column_exists(db: aiosqlite.Connection, table: str, column: str) -> bool:
+    """Return True if `column` is present in `table`."""
+    return column in await _table_columns(db, table)
 
 
 async def _table_exists(db: aiosqlite.Connection, table: str) -> bool:
@@ -172,53 +244,134 @@ async def _table_exists(db: aiosqlite.Connection, table: str) -> bool:
     return row[0] > 0
 
 
+async def _index_exists(db: aiosqlite.Connection, index: str) -> bool:
+    """Return True if `index` exists in the database."""
+    cur = await db.execute(
+        "SELECT count(*) FROM sqlite_master WHERE type='index' AND name=?",
+        (index,),
+    )
+    row = await cur.fetchone()
+    await cur.close()
+    return row[0] > 0
+
+
+async def _terms_table_is_legacy(db: aiosqlite.Connection) -> bool:
+    """Return True if entry_terms still uses the rowid + UNIQUE layout."""
+    cur = await db.execute("PRAGMA index_list('entry_terms')")
+    rows = await cur.fetchall()
+    await cur.close()
+    # PRAGMA index_list columns: seq, name, unique, origin, partial
+    return not any(r[3] == "pk" for r in rows)
+
+
 async def migrate_db() -> None:
     """Idempotent migrations for legacy DBs."""
     async with _connect() as db:
         await db.execute("PRAGMA foreign_keys = ON;")
         stmts = []
+        entry_cols = await _table_columns(db, "entries")
+        user_cols = await _table_columns(db, "users")
 
         # Map columns on entries
-        if not await _column_exists(db, "entries", "map_nonce"):
+        if "map_nonce" not in entry_cols:
             stmts.append("ALTER TABLE entries ADD COLUMN map_nonce BLOB;")
-        if not await _column_exists(db, "entries", "map_ct"):
+        if "map_ct" not in entry_cols:
             stmts.append("ALTER TABLE entries ADD COLUMN map_ct BLOB;")
-        if not await _column_exists(db, "entries", "map_format"):
+        if "map_format" not in entry_cols:
             stmts.append("ALTER TABLE entries ADD COLUMN map_format TEXT DEFAULT 'ascii';")
 
         # Security columns on users
-        if not await _column_exists(db, "users", "security_question"):
+        if "security_question" not in user_cols:
             stmts.append("ALTER TABLE users ADD COLUMN security_question TEXT NOT NULL DEFAULT '';")
-        if not await _column_exists(db, "users", "security_answer_hash"):
+        if "security_answer_hash" not in user_cols:
             stmts.append("ALTER TABLE users ADD COLUMN security_answer_hash TEXT NOT NULL DEFAULT '';")
+        # KEK derivation scheme (1 = scrypt, 2 = argon2id); legacy rows are scrypt
+        if "kek_version" not in user_cols:
+            stmts.append("ALTER TABLE users ADD COLUMN kek_version INTEGER NOT NULL DEFAULT 1;")
 
         # Phase 2 columns on entries
-        if not await _column_exists(db, "entries", "is_favorite"):
+        if "is_favorite" not in entry_cols:
             stmts.append("ALTER TABLE entries ADD COLUMN is_favorite INTEGER DEFAULT 0;")
-        if not await _column_exists(db, "entries", "word_count"):
+        if "word_count" not in entry_cols:
             stmts.append("ALTER TABLE entries ADD COLUMN word_count INTEGER DEFAULT 0;")
-        if not await _column_exists(db, "entries", "mood_nonce"):
+        if "mood_nonce" not in entry_cols:
             stmts.append("ALTER TABLE entries ADD COLUMN mood_nonce BLOB;")
-        if not await _column_exists(db, "entries", "mood_ct"):
+        if "mood_ct" not in entry_cols:
             stmts.append("ALTER TABLE entries ADD COLUMN mood_ct BLOB;")
-        if not await _column_exists(db, "entries", "weather_nonce"):
+        if "weather_nonce" not in entry_cols:
             stmts.append("ALTER TABLE entries ADD COLUMN weather_nonce BLOB;")
-        if not await _column_exists(db, "entries", "weather_ct"):
+        if "weather_ct" not in entry_cols:
             stmts.append("ALTER TABLE entries ADD COLUMN weather_ct BLOB;")
-        if not await _column_exists(db, "entries", "notebook_id"):
+        if "notebook_id" not in entry_cols:
             stmts.append("ALTER TABLE entries ADD COLUMN notebook_id INTEGER;")
 
-        for stmt in stmts:
-            await db.execute(stmt)
+        # entry_terms: rowid table + UNIQUE -> WITHOUT ROWID keyed on (term_hash, entry_id)
+        if await _terms_table_is_legacy(db):
+            stmts.extend([
+                """
+                CREATE TABLE entry_terms_new (
+                    term_hash       BLOB NOT NULL,
+                    entry_id        INTEGER NOT NULL,
+                    PRIMARY KEY (term_hash, entry_id),
+                    FOREIGN KEY (entry_id) REFERENCES entries(id) ON DELETE CASCADE
+                ) WITHOUT ROWID;
+                """,
+                "INSERT OR IGNORE INTO entry_terms_new (term_hash, entry_id) "
+                "SELECT term_hash, entry_id FROM entry_terms;",
+                "DROP TABLE entry_terms;",
+                "ALTER TABLE entry_terms_new RENAME TO entry_terms;",
+                "CREATE INDEX IF NOT EXISTS idx_terms_entry ON entry_terms(entry_id);",
+            ])
+
+        # idx_entries_user_created supersedes the single-column user index
+        if await _index_exists(db, "idx_entries_user"):
+            stmts.append("DROP INDEX IF EXISTS idx_entries_user;")
+        # The (term_hash, entry_id) primary key already covers term lookups
+        if await _index_exists(db, "idx_terms_hash"):
+            stmts.append("DROP INDEX IF EXISTS idx_terms_hash;")
+
+        cur = await db.execute("PRAGMA user_version")
+        user_version = (await cur.fetchone())[0]
+        await cur.close()
+        if user_version < 1:
+            # Shorten full 32-byte HMACs; a prefix clash within one entry is a duplicate
+            stmts.extend([
+                f"UPDATE OR IGNORE entry_terms SET term_hash = substr(term_hash, 1, {TERM_HASH_LEN}) "
+                f"WHERE length(term_hash) > {TERM_HASH_LEN};",
+                f"DELETE FROM entry_terms WHERE length(term_hash) > {TERM_HASH_LEN};",
+                f"UPDATE entry_tags SET tag_hash = substr(tag_hash, 1, {TERM_HASH_LEN}) "
+                f"WHERE length(tag_hash) > {TERM_HASH_LEN};",
+            ])
+        if user_version < SCHEMA_VERSION:
+            stmts.append(f"PRAGMA user_version = {SCHEMA_VERSION};")
 
         if stmts:
-            await db.commit()
+            # One script, one thread hop; explicit BEGIN/COMMIT keeps it all-or-nothing
+            # (sqlite3 opens no implicit transaction for DDL)
+            await db.executescript("BEGIN;\n" + "\n".join(stmts) + "\nCOMMIT;")
 
 
 # ---------------------------------------------------------------------
 # Connection / initialization
 # ---------------------------------------------------------------------
 
+async def backup_to(path: str) -> None:
+    """Write a consistent snapshot of the open DB to *path* (must not exist).
+
+    Uses ``VACUUM INTO`` (page-level copy in C, WAL-aware, free pages
+    dropped); engines older than 3.27 fall back to the online backup API.
+    """
+    async with _connect() as db:
+        if sqlite3.sqlite_version_info >= (3, 27, 0):
+            await db.execute("VACUUM INTO ?", (path,))
+            return
+        target = sqlite3.connect(path, check_same_thread=False)
+        try:
+            await db.backup(target)
+        finally:
+            target.close()
+
+
 async def init_db() -> None:
     """Create tables if they don't exist and run lightweight migrations."""
     async with _connect() as db:
@@ -232,7 +385,28 @@ async def init_db() -> None:
 # ---------------------------------------------------------------------
 
 async def get_user_by_username(username: str):
-    """Fetch a user row by *username*; returns Row or None."""
+    """Fetch the login/key-unwrap columns for *username*; returns Row or None.
+
+    Security Q/A columns are omitted; use :func:`get_user_full` for those.
+    """
+    async with _connect() as db:
+        db.row_factory = aiosqlite.Row
+        cur = await db.execute(
+            """
+            SELECT id, username, pwd_hash, kek_salt, kek_version,
+                   dek_wrapped, dek_wrap_nonce, created_at
+              FROM users
+             WHERE username = ?
+            """,
+            (username,),
+        )
+        row = await cur.fetchone()
+        await cur.close()
+        return row
+
+
+async def get_user_full(username: str):
+    """Fetch the whole user row for *username*, security Q/A included; returns Row or None."""
     async with _connect() as db:
         db.row_factory = aiosqlite.Row
         cur = await db.execute("SELECT * FROM users WHERE username = ?", (username,))
@@ -263,6 +437,7 @@ async def insert_user(
     security_question: str,
     security_answer_hash: str,
     created_at: str,
+    kek_version: int = 1,
 ) -> None:
     """Insert a newly registered user."""
     async with _connect() as conn:
@@ -273,18 +448,20 @@ async def insert_user(
                     username,
                     pwd_hash,
                     kek_salt,
+                    kek_version,
                     dek_wrapped,
                     dek_wrap_nonce,
                     security_question,
                     security_answer_hash,
                     created_at
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     username,
                     pwd_hash,
                     kek_salt,
+                    kek_version,
                     dek_wrapped,
                     dek_wrap_nonce,
                     security_question,
@@ -303,19 +480,24 @@ async def update_user_credentials(
     kek_salt: bytes,
     dek_wrapped: bytes,
     dek_wrap_nonce: bytes,
+    kek_version: Optional[int] = None,
 ) -> None:
-    """Update password credentials and wrapped DEK for a user."""
+    """Update password credentials and wrapped DEK for a user.
+
+    ``kek_version`` is left unchanged when None.
+    """
     async with _connect() as db:
         await db.execute(
             """
             UPDATE users
                SET pwd_hash = ?,
                    kek_salt = ?,
+                   kek_version = COALESCE(?, kek_version),
                    dek_wrapped = ?,
                    dek_wrap_nonce = ?
              WHERE id = ?
             """,
-            (pwd_hash, kek_salt, dek_wrapped, dek_wrap_nonce, user_id),
+            (pwd_hash, kek_salt, kek_version, dek_wrapped, dek_wrap_nonce, user_id),
         )
         await db.commit()
 
@@ -352,14 +534,112 @@ async def insert_entry_row(
         return cur.lastrowid
 
 
-async def insert_entry_terms(pairs: Sequence[Tuple[int, bytes]]) -> None:
-    """Bulk insert blind-index term rows."""
-    if not pairs:
+async def insert_entry_with_terms(
+    user_id: int,
+    created_at: str,
+    t_nonce: bytes,
+    t_ct: bytes,
+    b_nonce: bytes,
+    b_ct: bytes,
+    m_nonce: Optional[bytes],
+    m_ct: Optional[bytes],
+    m_fmt: str,
+    term_hashes: Sequence[bytes],
+    *,
+    word_count: int = 0,
+    notebook_id: Optional[int] = None,
+    mood_nonce: Optional[bytes] = None,
+    mood_ct: Optional[bytes] = None,
+    weather_nonce: Optional[bytes] = None,
+    weather_ct: Optional[bytes] = None,
+) -> int:
+    """Insert an entry row and its blind-index terms in one transaction; return entry id."""
+    async with _connect() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        cur = await db.execute(
+            """
+            INSERT INTO entries (
+                user_id, created_at,
+                title_nonce, title_ct,
+                body_nonce, body_ct,
+                map_nonce, map_ct, map_format,
+                word_count, notebook_id,
+                mood_nonce, mood_ct,
+                weather_nonce, weather_ct
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                user_id, created_at,
+                t_nonce, t_ct,
+                b_nonce, b_ct,
+                m_nonce, m_ct, m_fmt,
+                word_count, notebook_id,
+                mood_nonce, mood_ct,
+                weather_nonce, weather_ct,
+            ),
+        )
+        entry_id = cur.lastrowid
+        if term_hashes:
+            await db.executemany(
+                "INSERT OR IGNORE INTO entry_terms (entry_id, term_hash) VALUES (?, ?)",
+                ((entry_id, h) for h in term_hashes),
+            )
+        await db.commit()
+        return entry_id
+
+
+async def update_entry_with_terms(
+    entry_id: int,
+    user_id: int,
+    t_nonce: bytes,
+    t_ct: bytes,
+    b_nonce: bytes,
+    b_ct: bytes,
+    m_nonce: Optional[bytes],
+    m_ct: Optional[bytes],
+    m_fmt: str,
+    term_hashes: Iterable[bytes],
+    *,
+    word_count: int = 0,
+) -> None:
+    """Rewrite an entry's sealed fields, word count and blind-index terms in one transaction."""
+    async with _connect() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        cur = await db.execute(
+            """
+            UPDATE entries
+               SET title_nonce = ?, title_ct = ?,
+                   body_nonce = ?, body_ct = ?,
+                   map_nonce = ?, map_ct = ?, map_format = ?,
+                   word_count = ?
+             WHERE id = ? AND user_id = ?
+            """,
+            (
+                t_nonce, t_ct,
+                b_nonce, b_ct,
+                m_nonce, m_ct, m_fmt,
+                word_count,
+                entry_id, user_id,
+            ),
+        )
+        # Only re-index entries this user actually owns.
+        if cur.rowcount:
+            await db.execute("DELETE FROM entry_terms WHERE entry_id = ?", (entry_id,))
+            await db.executemany(
+                "INSERT OR IGNORE INTO entry_terms (entry_id, term_hash) VALUES (?, ?)",
+                ((entry_id, h) for h in term_hashes),
+            )
+        await db.commit()
+
+
+async def insert_entry_terms(pairs: Iterable[Tuple[int, bytes]]) -> None:
+    """Bulk insert blind-index term rows; *pairs* may be any iterable, e.g. a generator."""
+    if isinstance(pairs, Sequence) and not pairs:
         return
     async with _connect() as db:
         await db.executemany(
             "INSERT OR IGNORE INTO entry_terms (entry_id, term_hash) VALUES (?, ?)",
-            list(pairs),
+            pairs,
         )
         await db.commit()
 
@@ -382,6 +662,31 @@ async def list_entry_headers(user_id: int):
         return rows
 
 
+async def list_entry_headers_by_ids(user_id: int, entry_ids: Sequence[int]):
+    """Return header rows (id, created_at, title_nonce, title_ct) for the user's *entry_ids*.
+
+    Rows come back in no particular order; ids not owned by the user are skipped.
+    """
+    rows = []
+    async with _connect() as db:
+        db.row_factory = aiosqlite.Row
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(entry_ids), 500):
+            batch = entry_ids[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            cur = await db.execute(
+                f"""
+                SELECT id, created_at, title_nonce, title_ct
+                  FROM entries
+                 WHERE user_id = ? AND id IN ({placeholders})
+                """,
+                (user_id, *batch),
+            )
+            rows.extend(await cur.fetchall())
+            await cur.close()
+    return rows
+
+
 async def list_entry_rows_for_user(user_id: int):
     """Return all entry rows for a user, including all encrypted fields."""
     async with _connect() as db:
@@ -412,6 +717,48 @@ async def list_entry_rows_for_user(user_id: int):
         return rows
 
 
+async def iter_entry_rows_for_user(
+    user_id: int, chunk: int = 64
+) -> AsyncIterator[List[aiosqlite.Row]]:
+    """Yield a user's full entry rows in id order, at most *chunk* rows per batch.
+
+    Keyset-paginated, so only one batch of ciphertexts is held at a time and
+    the connection lock is released between batches.
+    """
+    last_id = 0
+    while True:
+        async with _connect() as db:
+            db.row_factory = aiosqlite.Row
+            cur = await db.execute(
+                """
+                SELECT id,
+                       created_at,
+                       title_nonce,
+                       title_ct,
+                       body_nonce,
+                       body_ct,
+                       map_nonce,
+                       map_ct,
+                       map_format,
+                       mood_nonce,
+                       mood_ct,
+                       weather_nonce,
+                       weather_ct
+                  FROM entries
+                 WHERE user_id = ? AND id > ?
+                 ORDER BY id
+                 LIMIT ?
+                """,
+                (user_id, last_id, chunk),
+            )
+            batch = await cur.fetchall()
+            await cur.close()
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]["id"]
+
+
 async def list_all_tags_for_user(user_id: int):
     """Return all tag rows for all entries of a user."""
     async with _connect() as db:
@@ -464,7 +811,10 @@ async def get_entry_row(user_id: int, entry_id: int):
 
 
 async def get_entry_ids_for_term(term_hash: bytes) -> List[int]:
-    """Return a list of entry ids that contain the given term hash."""
+    """Return a list of entry ids that contain the given term hash.
+
+    Answered from the entry_terms primary key alone (covering lookup).
+    """
     async with _connect() as db:
         cur = await db.execute(
             "SELECT entry_id FROM entry_terms WHERE term_hash = ?",
@@ -475,6 +825,28 @@ async def get_entry_ids_for_term(term_hash: bytes) -> List[int]:
         return [int(r[0]) for r in rows]
 
 
+async def get_entry_ids_for_all_terms(term_hashes: Sequence[bytes]) -> List[int]:
+    """Return ids of entries containing every term hash (AND), newest id first."""
+    if not term_hashes:
+        return []
+    placeholders = ",".join("?" * len(term_hashes))
+    async with _connect() as db:
+        cur = await db.execute(
+            f"""
+            SELECT entry_id
+              FROM entry_terms
+             WHERE term_hash IN ({placeholders})
+             GROUP BY entry_id
+            HAVING COUNT(DISTINCT term_hash) = ?
+             ORDER BY entry_id DESC
+            """,
+            (*term_hashes, len(set(term_hashes))),
+        )
+        rows = await cur.fetchall()
+        await cur.close()
+        return [int(r[0]) for r in rows]
+
+
 async def update_entry_row(
     entry_id: int,
     user_id: int,
@@ -588,21 +960,26 @@ async def change_password_atomically(
     notebook_updates: List[dict] | None = None,
     template_updates: List[dict] | None = None,
     draft_updates: List[dict] | None = None,
+    kek_version: Optional[int] = None,
 ) -> None:
-    """Atomically re-encrypt all data and update user credentials in one transaction."""
+    """Atomically re-encrypt all data and update user credentials in one transaction.
+
+    Each table is rewritten with a single executemany rather than one
+    statement per row.
+    """
     async with _connect() as conn:
         # Entry title/body/map/mood/weather
-        for eu in entry_updates:
-            await conn.execute(
-                """
-                UPDATE entries
-                   SET title_nonce = ?, title_ct = ?,
-                       body_nonce = ?, body_ct = ?,
-                       map_nonce = ?, map_ct = ?, map_format = ?,
-                       mood_nonce = ?, mood_ct = ?,
-                       weather_nonce = ?, weather_ct = ?
-                 WHERE id = ? AND user_id = ?
-                """,
+        await conn.executemany(
+            """
+            UPDATE entries
+               SET title_nonce = ?, title_ct = ?,
+                   body_nonce = ?, body_ct = ?,
+                   map_nonce = ?, map_ct = ?, map_format = ?,
+                   mood_nonce = ?, mood_ct = ?,
+                   weather_nonce = ?, weather_ct = ?
+             WHERE id = ? AND user_id = ?
+            """,
+            [
                 (
                     eu["title_nonce"], eu["title_ct"],
                     eu["body_nonce"], eu["body_ct"],
@@ -610,48 +987,54 @@ async def change_password_atomically(
                     eu.get("mood_nonce"), eu.get("mood_ct"),
                     eu.get("weather_nonce"), eu.get("weather_ct"),
                     eu["id"], user_id,
-                ),
-            )
-        # Clear and re-insert terms
-        for entry_id, pairs in term_updates:
-            await conn.execute("DELETE FROM entry_terms WHERE entry_id = ?", (entry_id,))
-            if pairs:
-                await conn.executemany(
-                    "INSERT OR IGNORE INTO entry_terms (entry_id, term_hash) VALUES (?, ?)",
-                    pairs,
                 )
+                for eu in entry_updates
+            ],
+        )
+        # Clear and re-insert terms
+        await conn.executemany(
+            "DELETE FROM entry_terms WHERE entry_id = ?",
+            [(entry_id,) for entry_id, _ in term_updates],
+        )
+        await conn.executemany(
+            "INSERT OR IGNORE INTO entry_terms (entry_id, term_hash) VALUES (?, ?)",
+            [pair for _, pairs in term_updates for pair in pairs],
+        )
         # Tags
-        for tu in (tag_updates or []):
-            await conn.execute(
-                "UPDATE entry_tags SET tag_nonce = ?, tag_ct = ?, tag_hash = ? WHERE id = ?",
-                (tu["tag_nonce"], tu["tag_ct"], tu["tag_hash"], tu["id"]),
-            )
+        await conn.executemany(
+            "UPDATE entry_tags SET tag_nonce = ?, tag_ct = ?, tag_hash = ? WHERE id = ?",
+            [(tu["tag_nonce"], tu["tag_ct"], tu["tag_hash"], tu["id"]) for tu in (tag_updates or [])],
+        )
         # Notebooks
-        for nu in (notebook_updates or []):
-            await conn.execute(
-                "UPDATE notebooks SET name_nonce = ?, name_ct = ? WHERE id = ?",
-                (nu["name_nonce"], nu["name_ct"], nu["id"]),
-            )
+        await conn.executemany(
+            "UPDATE notebooks SET name_nonce = ?, name_ct = ? WHERE id = ?",
+            [(nu["name_nonce"], nu["name_ct"], nu["id"]) for nu in (notebook_updates or [])],
+        )
         # Templates
-        for tu in (template_updates or []):
-            await conn.execute(
-                "UPDATE entry_templates SET title_nonce = ?, title_ct = ?, body_nonce = ?, body_ct = ? WHERE id = ?",
-                (tu["title_nonce"], tu["title_ct"], tu["body_nonce"], tu["body_ct"], tu["id"]),
-            )
+        await conn.executemany(
+            "UPDATE entry_templates SET title_nonce = ?, title_ct = ?, body_nonce = ?, body_ct = ? WHERE id = ?",
+            [
+                (tu["title_nonce"], tu["title_ct"], tu["body_nonce"], tu["body_ct"], tu["id"])
+                for tu in (template_updates or [])
+            ],
+        )
         # Drafts
-        for du in (draft_updates or []):
-            await conn.execute(
-                "UPDATE drafts SET title_nonce = ?, title_ct = ?, body_nonce = ?, body_ct = ? WHERE id = ?",
-                (du["title_nonce"], du["title_ct"], du["body_nonce"], du["body_ct"], du["id"]),
-            )
+        await conn.executemany(
+            "UPDATE drafts SET title_nonce = ?, title_ct = ?, body_nonce = ?, body_ct = ? WHERE id = ?",
+            [
+                (du["title_nonce"], du["title_ct"], du["body_nonce"], du["body_ct"], du["id"])
+                for du in (draft_updates or [])
+            ],
+        )
         # Update user credentials last
         await conn.execute(
             """
             UPDATE users
-               SET pwd_hash = ?, kek_salt = ?, dek_wrapped = ?, dek_wrap_nonce = ?
+               SET pwd_hash = ?, kek_salt = ?, kek_version = COALESCE(?, kek_version),
+                   dek_wrapped = ?, dek_wrap_nonce = ?
              WHERE id = ?
             """,
-            (pwd_hash, kek_salt, dek_wrapped, dek_wrap_nonce, user_id),
+            (pwd_hash, kek_salt, kek_version, dek_wrapped, dek_wrap_nonce, user_id),
         )
         await conn.commit()
 
@@ -6,13 +6,15 @@ Textual UI code. All side effects (DB + config I/O) are explicit and local.
 """
 from __future__ import annotations
 
-from typing import Dict, Set, Tuple, List
+from typing import Dict, Tuple, List, Sequence
 from pathlib import Path
 from datetime import datetime, timezone
+from collections import OrderedDict
+import asyncio
+import hmac
 import json
 import os
 import secrets # if not already imported
-import shutil
 from cyberjournal.map import text_to_map, render_colored_map
 from argon2.exceptions import VerifyMismatchError
 import logging
@@ -25,14 +27,21 @@ from .crypto import (
     PH,
     DEK_LEN,
     SessionKeys,
-    scrypt_kdf,
+    KDF_VERSION_CURRENT,
+    derive_kek,
     hkdf_derive,
     aesgcm_encrypt,
     aesgcm_decrypt,
+    aead_encrypt,
+    aead_decrypt,
+    aead_decrypt_many,
     normalize_tokens,
     hmac_token,
+    hmac_tokens,
     HKDF_INFO_ENC,
     HKDF_INFO_HMAC,
+    MAP_FORMAT_CHACHA_PREFIX,
+    has_aes_acceleration,
 )
 
 # ---------------------------------------------------------------------
@@ -59,23 +68,63 @@ def _config_dir() -> Path:
 def _config_path() -> Path:
     return _config_dir() / "config.json"
 
+# String spellings accepted as "on" for boolean settings in a hand-edited config
+_TRUTHY: frozenset[str] = frozenset({"1", "true", "on", "yes", "y"})
+
+def config_flag(cfg: Dict[str, object], key: str) -> bool:
+    """Read boolean setting *key* from *cfg*; strings such as "false" or "0" are off."""
+    value = cfg.get(key, DEFAULT_CONFIG.get(key, False))
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUTHY
+    return bool(value)
+
+# Parsed config per path: ((st_mtime_ns, st_size), merged dict). Screens call
+# load_config() on every compose, so unchanged files are not re-read.
+_CONFIG_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, object]]] = {}
+
+def _stat_key(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
 def load_config() -> Dict[str, object]:
     """Load the merged configuration (defaults + file)."""
     path = _config_path()
-    if not path.exists():
+    try:
+        key = _stat_key(path)
+    except FileNotFoundError:
         save_config(DEFAULT_CONFIG)
-        return json.loads(json.dumps(DEFAULT_CONFIG))
+        return dict(DEFAULT_CONFIG)
+    cached = _CONFIG_CACHE.get(str(path))
+    if cached is not None and cached[0] == key:
+        # Values are flat scalars, so a shallow copy keeps the cache unshared
+        return dict(cached[1])
     with path.open("r", encoding="utf-8") as f:
         data = json.load(f)
-    merged = json.loads(json.dumps(DEFAULT_CONFIG))
+    # Defaults are flat scalars, so a shallow copy is a full copy
+    merged = dict(DEFAULT_CONFIG)
     merged.update(data)
-    return merged
+    _CONFIG_CACHE[str(path)] = (key, merged)
+    return dict(merged)
 
 def save_config(cfg: Dict[str, object]) -> None:
-    """Persist *cfg* to the JSON config file."""
+    """Persist *cfg* to the JSON config file.
+
+    Written to a sibling temp file in one write, fsynced, then swapped in
+    with os.replace so a crash never leaves a truncated config behind.
+    The in-memory cache is refreshed with what was written.
+    """
     _config_dir().mkdir(parents=True, exist_ok=True)
-    with _config_path().open("w", encoding="utf-8") as f:
-        json.dump(cfg, f, indent=2)
+    path = _config_path()
+    tmp = path.with_suffix(".json.tmp")
+    payload = json.dumps(cfg, indent=2)
+    with tmp.open("w", encoding="utf-8") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    merged = dict(DEFAULT_CONFIG)
+    merged.update(json.loads(payload))
+    _CONFIG_CACHE[str(path)] = (_stat_key(path), merged)
 
 
 # ---------------------------------------------------------------------
@@ -87,12 +136,17 @@ async def init_db() -> None:
     await db.init_db()
 
 
+async def close_db() -> None:
+    """Close the shared SQLite connection (call on app shutdown)."""
+    await db.close_db()
+
+
 # ---------------------------------------------------------------------
 # Backup helpers
 # ---------------------------------------------------------------------
 
 
-def _backup_database() -> Path:
+async def _backup_database() -> Path:
     """Create a timestamped backup copy of the SQLite database."""
     db_path = Path(db.DB_PATH).expanduser()
     if not db_path.is_absolute():
@@ -104,7 +158,9 @@ def _backup_database() -> Path:
     backups_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     backup_path = backups_dir / f"{db_path.name}.bak-{timestamp}"
-    shutil.copy2(db_path, backup_path)
+    # VACUUM INTO refuses to overwrite; a same-second backup replaces the older one
+    backup_path.unlink(missing_ok=True)
+    await db.backup_to(str(backup_path))
     return backup_path
 
 
@@ -120,15 +176,15 @@ async def register_user(
 ) -> None:
     """Register a new user and store a wrapped DEK in the DB."""
     created_at = datetime.now(timezone.utc).isoformat()
-    pwd_hash = PH.hash(password)
+    pwd_hash = await asyncio.to_thread(PH.hash, password)
 
     if not security_question.strip() or not security_answer.strip():
         raise ValueError("Security question and answer are required")
 
-    answer_hash = PH.hash(security_answer)
+    answer_hash = await asyncio.to_thread(PH.hash, security_answer)
     dek = secrets.token_bytes(DEK_LEN)
     kek_salt = secrets.token_bytes(16)
-    kek = scrypt_kdf(password, kek_salt, 32)
+    kek = await asyncio.to_thread(derive_kek, password, kek_salt, KDF_VERSION_CURRENT, 32)
     wrap_key = hkdf_derive(kek, b"wrap-key", 32)
     nonce, wrapped = aesgcm_encrypt(wrap_key, dek, aad=username.encode())
 
@@ -141,19 +197,23 @@ async def register_user(
         security_question,
         answer_hash,
         created_at,
+        kek_version=KDF_VERSION_CURRENT,
     )
 
+
 async def login_user(username: str, password: str) -> SessionKeys:
     """Authenticate user and return derived session keys."""
     row = await db.get_user_by_username(username)
     if not row:
         raise ValueError("User not found")
     try:
-        PH.verify(row["pwd_hash"], password)
+        await asyncio.to_thread(PH.verify, row["pwd_hash"], password)
     except VerifyMismatchError as exc:
         raise ValueError("Invalid password") from exc
 
-    kek = scrypt_kdf(password, row["kek_salt"], 32)
+    # The memory-hard KEK derivation only runs for a verified password
+    kek_version = row["kek_version"]
+    kek = await asyncio.to_thread(derive_kek, password, row["kek_salt"], kek_version, 32)
     wrap_key = hkdf_derive(kek, b"wrap-key", 32)
     dek = aesgcm_decrypt(
         wrap_key,
@@ -162,6 +222,21 @@ async def login_user(username: str, password: str) -> SessionKeys:
         aad=row["username"].encode(),
     )
 
+    if kek_version != KDF_VERSION_CURRENT:
+        # Upgrade legacy KEK derivation: re-wrap the same DEK, data is untouched
+        new_kek_salt = secrets.token_bytes(16)
+        new_kek = await asyncio.to_thread(derive_kek, password, new_kek_salt, KDF_VERSION_CURRENT, 32)
+        new_wrap_key = hkdf_derive(new_kek, b"wrap-key", 32)
+        new_nonce, new_wrapped = aesgcm_encrypt(new_wrap_key, dek, aad=row["username"].encode())
+        await db.update_user_credentials(
+            row["id"],
+            row["pwd_hash"],
+            new_kek_salt,
+            new_wrapped,
+            new_nonce,
+            kek_version=KDF_VERSION_CURRENT,
+        )
+
     enc_key = hkdf_derive(dek, HKDF_INFO_ENC, 32)
     search_key = hkdf_derive(dek, HKDF_INFO_HMAC, 32)
     return SessionKeys(
@@ -201,112 +276,147 @@ async def change_password_logged_in(
     if row["id"] != sess.user_id:
         raise ValueError("Session mismatch")
     try:
-        PH.verify(row["pwd_hash"], current_password)
+        await asyncio.to_thread(PH.verify, row["pwd_hash"], current_password)
     except VerifyMismatchError as exc:
         raise ValueError("Invalid password") from exc
 
-    _backup_database()
+    await _backup_database()
 
     new_dek = secrets.token_bytes(DEK_LEN)
-    new_pwd_hash = PH.hash(new_password)
+    new_pwd_hash = await asyncio.to_thread(PH.hash, new_password)
     new_kek_salt = secrets.token_bytes(16)
-    new_kek = scrypt_kdf(new_password, new_kek_salt, 32)
+    new_kek = await asyncio.to_thread(derive_kek, new_password, new_kek_salt, KDF_VERSION_CURRENT, 32)
     new_wrap_key = hkdf_derive(new_kek, b"wrap-key", 32)
-    new_nonce, new_wrapped = aesgcm_encrypt(new_wrap_key, new_dek, aad=sess.username.encode())
+    new_nonce, new_wrapped = aesgcm_encrypt(new_wrap_key, new_dek, aad=sess.username_bytes)
 
     new_enc_key = hkdf_derive(new_dek, HKDF_INFO_ENC, 32)
     new_search_key = hkdf_derive(new_dek, HKDF_INFO_HMAC, 32)
+    new_sess = SessionKeys(
+        user_id=sess.user_id,
+        username=sess.username,
+        dek=new_dek,
+        enc_key=new_enc_key,
+        search_key=new_search_key,
+    )
+    # One AES-GCM context per key for the whole re-key pass (no per-row setup)
+    old_cipher = sess.enc_cipher
+    new_cipher = new_sess.enc_cipher
 
     # Re-encrypt all data in memory first, then commit atomically
-    aad = sess.username.encode()
+    aad = sess.username_bytes
 
     def _reenc(old_nonce, old_ct):
         """Decrypt with old key, re-encrypt with new key. Returns (nonce, ct)."""
-        plaintext = aesgcm_decrypt(sess.enc_key, old_nonce, old_ct, aad=aad)
-        return aesgcm_encrypt(new_enc_key, plaintext, aad=aad)
+        plaintext = aead_decrypt(old_cipher, old_nonce, old_ct, aad=aad)
+        return aead_encrypt(new_cipher, plaintext, aad=aad)
 
-    # --- Entries ---
-    rows = await db.list_entry_rows_for_user(sess.user_id)
-    entry_updates = []
-    term_updates = []
-    for entry in rows:
-        title = aesgcm_decrypt(sess.enc_key, entry["title_nonce"], entry["title_ct"], aad=aad).decode()
-        body = aesgcm_decrypt(sess.enc_key, entry["body_nonce"], entry["body_ct"], aad=aad).decode()
-
-        t_nonce, t_ct = aesgcm_encrypt(new_enc_key, title.encode(), aad=aad)
-        b_nonce, b_ct = aesgcm_encrypt(new_enc_key, body.encode(), aad=aad)
-
-        map_nonce = map_ct = None
-        map_format = entry["map_format"] or "ascii"
-        if entry["map_ct"]:
-            map_nonce, map_ct = _reenc(entry["map_nonce"], entry["map_ct"])
-
-        mood_nonce = mood_ct = None
-        if entry["mood_ct"]:
-            mood_nonce, mood_ct = _reenc(entry["mood_nonce"], entry["mood_ct"])
-
-        weather_nonce = weather_ct = None
-        if entry["weather_ct"]:
-            weather_nonce, weather_ct = _reenc(entry["weather_nonce"], entry["weather_ct"])
-
-        entry_updates.append({
-            "id": entry["id"],
-            "title_nonce": t_nonce, "title_ct": t_ct,
-            "body_nonce": b_nonce, "body_ct": b_ct,
-            "map_nonce": map_nonce, "map_ct": map_ct, "map_format": map_format,
-            "mood_nonce": mood_nonce, "mood_ct": mood_ct,
-            "weather_nonce": weather_nonce, "weather_ct": weather_ct,
-        })
-
-        terms: Set[str] = set(normalize_tokens(title) + normalize_tokens(body))
-        pairs = [(entry["id"], hmac_token(new_search_key, t)) for t in terms]
-        term_updates.append((entry["id"], pairs))
-
-    # --- Tags ---
     tag_rows = await db.list_all_tags_for_user(sess.user_id)
-    tag_updates = []
-    for tag in tag_rows:
-        tag_text = aesgcm_decrypt(sess.enc_key, tag["tag_nonce"], tag["tag_ct"], aad=aad).decode()
-        new_tag_nonce, new_tag_ct = aesgcm_encrypt(new_enc_key, tag_text.encode(), aad=aad)
-        new_tag_hash = hmac_token(new_search_key, tag_text.lower())
-        tag_updates.append({
-            "id": tag["id"],
-            "tag_nonce": new_tag_nonce, "tag_ct": new_tag_ct, "tag_hash": new_tag_hash,
-        })
-
-    # --- Notebooks ---
     nb_rows = await db.list_notebooks(sess.user_id)
-    notebook_updates = []
-    for nb in nb_rows:
-        nb_name = aesgcm_decrypt(sess.enc_key, nb["name_nonce"], nb["name_ct"], aad=aad).decode()
-        new_nb_nonce, new_nb_ct = aesgcm_encrypt(new_enc_key, nb_name.encode(), aad=aad)
-        notebook_updates.append({
-            "id": nb["id"], "name_nonce": new_nb_nonce, "name_ct": new_nb_ct,
-        })
-
-    # --- Templates ---
     tpl_rows = await db.list_templates(sess.user_id)
-    template_updates = []
-    for tpl in tpl_rows:
-        tpl_title = aesgcm_decrypt(sess.enc_key, tpl["title_nonce"], tpl["title_ct"], aad=aad).decode()
-        tpl_body = aesgcm_decrypt(sess.enc_key, tpl["body_nonce"], tpl["body_ct"], aad=aad).decode()
-        tn, tc = aesgcm_encrypt(new_enc_key, tpl_title.encode(), aad=aad)
-        bn, bc = aesgcm_encrypt(new_enc_key, tpl_body.encode(), aad=aad)
-        template_updates.append({
-            "id": tpl["id"], "title_nonce": tn, "title_ct": tc, "body_nonce": bn, "body_ct": bc,
-        })
-
-    # --- Drafts ---
     draft_rows = await db.list_all_drafts_for_user(sess.user_id)
-    draft_updates = []
-    for dr in draft_rows:
-        dr_title = aesgcm_decrypt(sess.enc_key, dr["title_nonce"], dr["title_ct"], aad=aad).decode()
-        dr_body = aesgcm_decrypt(sess.enc_key, dr["body_nonce"], dr["body_ct"], aad=aad).decode()
-        dn, dc = aesgcm_encrypt(new_enc_key, dr_title.encode(), aad=aad)
-        dbn, dbc = aesgcm_encrypt(new_enc_key, dr_body.encode(), aad=aad)
-        draft_updates.append({
-            "id": dr["id"], "title_nonce": dn, "title_ct": dc, "body_nonce": dbn, "body_ct": dbc,
-        })
+
+    def _rekey_entries(rows):
+        """CPU-only re-encryption of one batch of entry rows; runs in a worker thread."""
+        entry_updates = []
+        term_updates = []
+        for entry in rows:
+            # Plaintext bytes go straight back into the new cipher; only the
+            # tokenizer needs decoded text. Maps are never decoded at all.
+            title_pt = aead_decrypt(old_cipher, entry["title_nonce"], entry["title_ct"], aad=aad)
+            body_pt = aead_decrypt(old_cipher, entry["body_nonce"], entry["body_ct"], aad=aad)
+
+            t_nonce, t_ct = aead_encrypt(new_cipher, title_pt, aad=aad)
+            b_nonce, b_ct = aead_encrypt(new_cipher, body_pt, aad=aad)
+
+            map_nonce = map_ct = None
+            map_format = entry["map_format"] or "ascii"
+            if entry["map_ct"]:
+                map_nonce, map_ct, map_format = _reseal_map(
+                    sess, new_sess, entry["map_nonce"], entry["map_ct"], map_format
+                )
+
+            mood_nonce = mood_ct = None
+            if entry["mood_ct"]:
+                mood_nonce, mood_ct = _reenc(entry["mood_nonce"], entry["mood_ct"])
+
+            weather_nonce = weather_ct = None
+            if entry["weather_ct"]:
+                weather_nonce, weather_ct = _reenc(entry["weather_nonce"], entry["weather_ct"])
+
+            entry_updates.append({
+                "id": entry["id"],
+                "title_nonce": t_nonce, "title_ct": t_ct,
+                "body_nonce": b_nonce, "body_ct": b_ct,
+                "map_nonce": map_nonce, "map_ct": map_ct, "map_format": map_format,
+                "mood_nonce": mood_nonce, "mood_ct": mood_ct,
+                "weather_nonce": weather_nonce, "weather_ct": weather_ct,
+            })
+
+            terms = normalize_tokens(title_pt.decode()) + normalize_tokens(body_pt.decode())
+            pairs = [(entry["id"], h) for h in hmac_tokens(new_search_key, terms)]
+            term_updates.append((entry["id"], pairs))
+        return entry_updates, term_updates
+
+    def _reencrypt_rest():
+        """CPU-only re-encryption of tags, notebooks, templates and drafts."""
+        # --- Tags ---
+        tag_updates = []
+        tag_texts = [
+            aead_decrypt(old_cipher, tag["tag_nonce"], tag["tag_ct"], aad=aad).decode() for tag in tag_rows
+        ]
+        # One batched HMAC pass over the distinct tag keys (same "tag:" form as add_tag)
+        distinct = list(dict.fromkeys(f"tag:{t.lower()}" for t in tag_texts))
+        tag_hashes = dict(zip(distinct, hmac_tokens(new_search_key, distinct), strict=True))
+        for tag, tag_text in zip(tag_rows, tag_texts, strict=True):
+            new_tag_nonce, new_tag_ct = aead_encrypt(new_cipher, tag_text.encode(), aad=aad)
+            new_tag_hash = tag_hashes[f"tag:{tag_text.lower()}"]
+            tag_updates.append({
+                "id": tag["id"],
+                "tag_nonce": new_tag_nonce, "tag_ct": new_tag_ct, "tag_hash": new_tag_hash,
+            })
+
+        # --- Notebooks ---
+        notebook_updates = []
+        for nb in nb_rows:
+            nb_name = aead_decrypt(old_cipher, nb["name_nonce"], nb["name_ct"], aad=aad).decode()
+            new_nb_nonce, new_nb_ct = aead_encrypt(new_cipher, nb_name.encode(), aad=aad)
+            notebook_updates.append({
+                "id": nb["id"], "name_nonce": new_nb_nonce, "name_ct": new_nb_ct,
+            })
+
+        # --- Templates ---
+        template_updates = []
+        for tpl in tpl_rows:
+            tpl_title = aead_decrypt(old_cipher, tpl["title_nonce"], tpl["title_ct"], aad=aad).decode()
+            tpl_body = aead_decrypt(old_cipher, tpl["body_nonce"], tpl["body_ct"], aad=aad).decode()
+            tn, tc = aead_encrypt(new_cipher, tpl_title.encode(), aad=aad)
+            bn, bc = aead_encrypt(new_cipher, tpl_body.encode(), aad=aad)
+            template_updates.append({
+                "id": tpl["id"], "title_nonce": tn, "title_ct": tc, "body_nonce": bn, "body_ct": bc,
+            })
+
+        # --- Drafts ---
+        draft_updates = []
+        for dr in draft_rows:
+            dr_title = aead_decrypt(old_cipher, dr["title_nonce"], dr["title_ct"], aad=aad).decode()
+            dr_body = aead_decrypt(old_cipher, dr["body_nonce"], dr["body_ct"], aad=aad).decode()
+            dn, dc = aead_encrypt(new_cipher, dr_title.encode(), aad=aad)
+            dbn, dbc = aead_encrypt(new_cipher, dr_body.encode(), aad=aad)
+            draft_updates.append({
+                "id": dr["id"], "title_nonce": dn, "title_ct": dc, "body_nonce": dbn, "body_ct": dbc,
+            })
+
+        return tag_updates, notebook_updates, template_updates, draft_updates
+
+    # --- Entries --- streamed in batches so only one batch of old ciphertext is live
+    entry_updates = []
+    term_updates = []
+    async for batch in db.iter_entry_rows_for_user(sess.user_id):
+        batch_entries, batch_terms = await asyncio.to_thread(_rekey_entries, batch)
+        entry_updates.extend(batch_entries)
+        term_updates.extend(batch_terms)
+
+    tag_updates, notebook_updates, template_updates, draft_updates = await asyncio.to_thread(_reencrypt_rest)
 
     await db.change_password_atomically(
         sess.user_id,
@@ -320,15 +430,11 @@ async def change_password_logged_in(
         notebook_updates=notebook_updates,
         template_updates=template_updates,
         draft_updates=draft_updates,
+        kek_version=KDF_VERSION_CURRENT,
     )
+    clear_map_cache()
 
-    return SessionKeys(
-        user_id=sess.user_id,
-        username=sess.username,
-        dek=new_dek,
-        enc_key=new_enc_key,
-        search_key=new_search_key,
-    )
+    return new_sess
 
 
 async def reset_password_with_security_answer(
@@ -342,21 +448,21 @@ async def reset_password_with_security_answer(
     if not new_password:
         raise ValueError("New password required")
 
-    row = await db.get_user_by_username(username)
+    row = await db.get_user_full(username)
     if not row:
         raise ValueError("User not found")
     try:
-        PH.verify(row["security_answer_hash"], security_answer)
+        await asyncio.to_thread(PH.verify, row["security_answer_hash"], security_answer)
     except VerifyMismatchError as exc:
         raise ValueError("Invalid security answer") from exc
 
-    _backup_database()
+    await _backup_database()
     await db.delete_entries_for_user(row["id"])
 
     new_dek = secrets.token_bytes(DEK_LEN)
-    new_pwd_hash = PH.hash(new_password)
+    new_pwd_hash = await asyncio.to_thread(PH.hash, new_password)
     new_kek_salt = secrets.token_bytes(16)
-    new_kek = scrypt_kdf(new_password, new_kek_salt, 32)
+    new_kek = await asyncio.to_thread(derive_kek, new_password, new_kek_salt, KDF_VERSION_CURRENT, 32)
     new_wrap_key = hkdf_derive(new_kek, b"wrap-key", 32)
     new_nonce, new_wrapped = aesgcm_encrypt(new_wrap_key, new_dek, aad=username.encode())
 
@@ -366,7 +472,9 @@ async def reset_password_with_security_answer(
         new_kek_salt,
         new_wrapped,
         new_nonce,
+        kek_version=KDF_VERSION_CURRENT,
     )
+    clear_map_cache()
 
 
 # ---------------------------------------------------------------------
@@ -389,42 +497,37 @@ async def add_entry(
     """Insert an encrypted entry; return new entry id."""
     created_at = datetime.now(timezone.utc).isoformat()
 
-    t_nonce, t_ct = aesgcm_encrypt(sess.enc_key, title.encode(), aad=sess.username.encode())
-    b_nonce, b_ct = aesgcm_encrypt(sess.enc_key, body.encode(), aad=sess.username.encode())
+    t_nonce, t_ct = aead_encrypt(sess.enc_cipher, title.encode(), aad=sess.username_bytes)
+    b_nonce, b_ct = aead_encrypt(sess.enc_cipher, body.encode(), aad=sess.username_bytes)
+
+    map_text, map_fmt = await _entry_map_text(sess, title, body, fmt="ascii", max_side=32)
+    m_nonce, m_ct, map_fmt = _seal_map(sess, map_text, map_fmt)
+
+    mood_nonce = mood_ct = weather_nonce = weather_ct = None
+    if mood:
+        mood_nonce, mood_ct = aead_encrypt(sess.enc_cipher, mood.encode(), aad=sess.username_bytes)
+    if weather:
+        weather_nonce, weather_ct = aead_encrypt(sess.enc_cipher, weather.encode(), aad=sess.username_bytes)
+
+    wc = _word_count(f"{title} {body}")
 
-    map_text, map_fmt = _render_entry_map_text(title, body, fmt="ascii", max_side=32)
-    m_nonce, m_ct = aesgcm_encrypt(sess.enc_key, map_text.encode("utf-8"), aad=sess.username.encode())
+    # Blind index
+    term_hashes = hmac_tokens(sess.search_key, normalize_tokens(title) + normalize_tokens(body))
 
-    eid = await db.insert_entry_row(
+    # Entry row, metadata and terms are written in a single transaction
+    eid = await db.insert_entry_with_terms(
         sess.user_id,
         created_at,
         t_nonce, t_ct,
         b_nonce, b_ct,
         m_nonce, m_ct, map_fmt,
+        term_hashes,
+        word_count=wc,
+        notebook_id=notebook_id,
+        mood_nonce=mood_nonce, mood_ct=mood_ct,
+        weather_nonce=weather_nonce, weather_ct=weather_ct,
     )
 
-    # Set word count
-    wc = _word_count(f"{title} {body}")
-    await db.update_word_count(eid, sess.user_id, wc)
-
-    # Set notebook if provided
-    if notebook_id is not None:
-        await db.set_entry_notebook(eid, sess.user_id, notebook_id)
-
-    # Encrypt and store mood/weather if provided
-    if mood or weather:
-        mood_nonce = mood_ct = weather_nonce = weather_ct = None
-        if mood:
-            mood_nonce, mood_ct = aesgcm_encrypt(sess.enc_key, mood.encode(), aad=sess.username.encode())
-        if weather:
-            weather_nonce, weather_ct = aesgcm_encrypt(sess.enc_key, weather.encode(), aad=sess.username.encode())
-        await db.update_entry_mood_weather(eid, sess.user_id, mood_nonce, mood_ct, weather_nonce, weather_ct)
-
-    # Blind index
-    terms: Set[str] = set(normalize_tokens(title) + normalize_tokens(body))
-    pairs = [(eid, hmac_token(sess.search_key, t)) for t in terms]
-    await db.insert_entry_terms(pairs)
-
     # World integration hook
     try:
         from cyberjournal.world.hooks import on_entry_created
@@ -438,30 +541,25 @@ async def add_entry(
 async def update_entry(sess: SessionKeys, entry_id: int,
                      new_title: str, new_body: str) -> None:
     """Re-encrypt title/body, regenerate map, update word count and blind index."""
-    t_nonce, t_ct = aesgcm_encrypt(sess.enc_key, new_title.encode(), aad=sess.username.encode())
-    b_nonce, b_ct = aesgcm_encrypt(sess.enc_key, new_body.encode(),  aad=sess.username.encode())
+    t_nonce, t_ct = aead_encrypt(sess.enc_cipher, new_title.encode(), aad=sess.username_bytes)
+    b_nonce, b_ct = aead_encrypt(sess.enc_cipher, new_body.encode(),  aad=sess.username_bytes)
 
     # Regenerate map
-    map_text, map_fmt = _render_entry_map_text(new_title, new_body, fmt="ascii", max_side=32)
-    m_nonce, m_ct = aesgcm_encrypt(sess.enc_key, map_text.encode("utf-8"), aad=sess.username.encode())
+    map_text, map_fmt = await _entry_map_text(sess, new_title, new_body, fmt="ascii", max_side=32)
+    m_nonce, m_ct, map_fmt = _seal_map(sess, map_text, map_fmt)
+
+    wc = _word_count(f"{new_title} {new_body}")
+    terms = normalize_tokens(new_title) + normalize_tokens(new_body)
 
-    await db.update_entry_row_with_map(
+    # Entry, word count and blind index commit together
+    await db.update_entry_with_terms(
         entry_id, sess.user_id,
         t_nonce, t_ct, b_nonce, b_ct,
         m_nonce, m_ct, map_fmt,
+        hmac_tokens(sess.search_key, terms),
+        word_count=wc,
     )
 
-    # Update word count
-    wc = _word_count(f"{new_title} {new_body}")
-    await db.update_word_count(entry_id, sess.user_id, wc)
-
-    # Rebuild blind index terms
-    await db.clear_entry_terms(entry_id)
-    terms: Set[str] = set(normalize_tokens(new_title) + normalize_tokens(new_body))
-    pairs: list[Tuple[int, bytes]] = [(entry_id, hmac_token(sess.search_key, t)) for t in terms]
-    if pairs:
-        await db.insert_entry_terms(pairs)
-
     # World integration hook
     try:
         from cyberjournal.world.hooks import on_entry_edited
@@ -512,38 +610,52 @@ async def rebuild_world(sess: SessionKeys) -> int:
 async def list_entries(sess: SessionKeys) -> List[Tuple[int, str, str]]:
     """Return list of (id, created_at iso, decrypted_title)."""
     rows = await db.list_entry_headers(sess.user_id)
-    out: List[Tuple[int, str, str]] = []
-    for r in rows:
-        title = aesgcm_decrypt(
-            sess.enc_key, r["title_nonce"], r["title_ct"], aad=sess.username.encode()
-        ).decode()
-        out.append((r["id"], r["created_at"], title))
-    return out
+    titles = await asyncio.to_thread(
+        aead_decrypt_many,
+        sess.enc_cipher,
+        [(r["title_nonce"], r["title_ct"]) for r in rows],
+        aad=sess.username_bytes,
+    )
+    return [(r["id"], r["created_at"], t.decode()) for r, t in zip(rows, titles, strict=True)]
+
+async def list_entries_by_ids(sess: SessionKeys, entry_ids: Sequence[int]) -> List[Tuple[int, str, str]]:
+    """Return (id, created_at iso, decrypted_title) for *entry_ids*, in the given order.
+
+    One query for all ids and titles only, so search results never decrypt
+    bodies. Ids that don't exist or belong to another user are dropped.
+    """
+    if not entry_ids:
+        return []
+    rows = await db.list_entry_headers_by_ids(sess.user_id, list(entry_ids))
+    titles = await asyncio.to_thread(
+        aead_decrypt_many,
+        sess.enc_cipher,
+        [(r["title_nonce"], r["title_ct"]) for r in rows],
+        aad=sess.username_bytes,
+    )
+    by_id = {r["id"]: (r["id"], r["created_at"], t.decode()) for r, t in zip(rows, titles, strict=True)}
+    return [by_id[eid] for eid in entry_ids if eid in by_id]
 
 async def get_entry(sess: SessionKeys, entry_id: int) -> Tuple[str, str, str]:
     """Return (created_at iso, title, body) for *entry_id* or error."""
     r = await db.get_entry_row(sess.user_id, entry_id)
     if not r:
         raise EntryNotFoundError("Entry not found")
-    title = aesgcm_decrypt(
-        sess.enc_key, r["title_nonce"], r["title_ct"], aad=sess.username.encode()
+    title = aead_decrypt(
+        sess.enc_cipher, r["title_nonce"], r["title_ct"], aad=sess.username_bytes
     ).decode()
-    body = aesgcm_decrypt(
-        sess.enc_key, r["body_nonce"], r["body_ct"], aad=sess.username.encode()
+    body = aead_decrypt(
+        sess.enc_cipher, r["body_nonce"], r["body_ct"], aad=sess.username_bytes
     ).decode()
     return r["created_at"], title, body
 
 async def search_entries(sess: SessionKeys, query: str) -> List[int]:
     """Return entry ids that contain ALL tokens in *query* (AND)."""
-    tokens = [t for t in normalize_tokens(query) if t]
+    # normalize_tokens never yields empty strings; the AND runs as one SQL query
+    tokens = normalize_tokens(query)
     if not tokens:
         return []
-    id_sets = []
-    for token in tokens:
-        th = hmac_token(sess.search_key, token)
-        ids = await db.get_entry_ids_for_term(th)
-        id_sets.append(set(ids))
-    return sorted(set.intersection(*id_sets), reverse=True) if id_sets else []
+    return await db.get_entry_ids_for_all_terms(hmac_tokens(sess.search_key, tokens))
 
 def _render_entry_map_text(title: str, body: str, *, fmt: str = "utf", max_side: int = 64) -> tuple[str, str]:
     """
@@ -561,19 +673,83 @@ def _render_entry_map_text(title: str, body: str, *, fmt: str = "utf", max_side:
     map_text = render_colored_map(types, legend, charset=charset, color=False, border=False)
     return map_text, fmt
 
+# Rendered entry maps keyed by (HMAC(search_key, title\nbody), fmt, max_side).
+# The maps carry keywords from the entry text, so keys are per user and the
+# cache is dropped on logout and password change. Only touched from the
+# event loop; generation itself runs in a worker thread.
+_MAP_CACHE: OrderedDict[Tuple[bytes, str, int], Tuple[str, str]] = OrderedDict()
+_MAP_CACHE_SIZE = 256
+
+def clear_map_cache() -> None:
+    """Forget every cached map preview (call when a session ends)."""
+    _MAP_CACHE.clear()
+
+async def _entry_map_text(
+    sess: SessionKeys, title: str, body: str, *, fmt: str = "utf", max_side: int = 64
+) -> tuple[str, str]:
+    """Cached, off-loop :func:`_render_entry_map_text`; re-saving unchanged text is free."""
+    digest = hmac.digest(sess.search_key, f"{title}\n{body}".encode(), "sha256")
+    key = (digest, fmt, max_side)
+    hit = _MAP_CACHE.get(key)
+    if hit is not None:
+        _MAP_CACHE.move_to_end(key)
+        return hit
+    result = await asyncio.to_thread(_render_entry_map_text, title, body, fmt=fmt, max_side=max_side)
+    _MAP_CACHE[key] = result
+    if len(_MAP_CACHE) > _MAP_CACHE_SIZE:
+        _MAP_CACHE.popitem(last=False)
+    return result
+
+def _map_seal_cipher(sess: SessionKeys, fmt: str):
+    """Pick the cipher for sealing a map preview; returns (cipher, stored map_format).
+
+    Hosts without AES instructions use ChaCha20-Poly1305, which is much
+    faster than software AES-GCM; such rows get MAP_FORMAT_CHACHA_PREFIX.
+    """
+    if has_aes_acceleration():
+        return sess.enc_cipher, fmt
+    return sess.map_chacha_cipher, MAP_FORMAT_CHACHA_PREFIX + fmt
+
+def _map_open_cipher(sess: SessionKeys, stored_fmt: str | None):
+    """Pick the cipher a stored map was sealed with; returns (cipher, map_format without prefix)."""
+    fmt = stored_fmt or "ascii"
+    if fmt.startswith(MAP_FORMAT_CHACHA_PREFIX):
+        return sess.map_chacha_cipher, fmt[len(MAP_FORMAT_CHACHA_PREFIX):]
+    return sess.enc_cipher, fmt
+
+def _seal_map(sess: SessionKeys, map_text: str, fmt: str) -> Tuple[bytes, bytes, str]:
+    """Encrypt a map preview; returns (nonce, ct, stored map_format)."""
+    cipher, stored_fmt = _map_seal_cipher(sess, fmt)
+    nonce, ct = aead_encrypt(cipher, map_text.encode("utf-8"), aad=sess.username_bytes)
+    return nonce, ct, stored_fmt
+
+def _open_map(sess: SessionKeys, nonce: bytes, ct: bytes, stored_fmt: str | None) -> Tuple[str, str]:
+    """Decrypt a stored map preview; returns (map_text, map_format without cipher prefix)."""
+    cipher, fmt = _map_open_cipher(sess, stored_fmt)
+    return aead_decrypt(cipher, nonce, ct, aad=sess.username_bytes).decode(), fmt
+
+def _reseal_map(old: SessionKeys, new: SessionKeys, nonce: bytes, ct: bytes,
+                stored_fmt: str | None) -> Tuple[bytes, bytes, str]:
+    """Move a sealed map preview from *old* to *new* keys without decoding the plaintext."""
+    old_cipher, fmt = _map_open_cipher(old, stored_fmt)
+    plaintext = aead_decrypt(old_cipher, nonce, ct, aad=old.username_bytes)
+    new_cipher, new_fmt = _map_seal_cipher(new, fmt)
+    nonce, ct = aead_encrypt(new_cipher, plaintext, aad=new.username_bytes)
+    return nonce, ct, new_fmt
+
 async def get_entry_with_map(sess: SessionKeys, entry_id: int):
     """Return (created_at, title, body, map_text, map_format) for one entry."""
     row = await db.get_entry_row(sess.user_id, entry_id)
     if not row:
         raise EntryNotFoundError("Entry not found")
 
-    title = aesgcm_decrypt(sess.enc_key, row["title_nonce"], row["title_ct"], aad=sess.username.encode()).decode()
-    body  = aesgcm_decrypt(sess.enc_key, row["body_nonce"],  row["body_ct"],  aad=sess.username.encode()).decode()
+    title = aead_decrypt(sess.enc_cipher, row["title_nonce"], row["title_ct"], aad=sess.username_bytes).decode()
+    body  = aead_decrypt(sess.enc_cipher, row["body_nonce"],  row["body_ct"],  aad=sess.username_bytes).decode()
 
     map_text = ""
     map_fmt  = (row["map_format"] or "ascii") if "map_format" in row.keys() else "ascii"
     if "map_ct" in row.keys() and row["map_ct"]:
-        map_text = aesgcm_decrypt(sess.enc_key, row["map_nonce"], row["map_ct"], aad=sess.username.encode()).decode()
+        map_text, map_fmt = _open_map(sess, row["map_nonce"], row["map_ct"], map_fmt)
 
     return row["created_at"], title, body, map_text, map_fmt
 
@@ -584,12 +760,12 @@ async def get_entry_full(sess: SessionKeys, entry_id: int) -> dict:
     if not row:
         raise EntryNotFoundError("Entry not found")
 
-    aad = sess.username.encode()
+    aad = sess.username_bytes
     result = {
         "id": row["id"],
         "created_at": row["created_at"],
-        "title": aesgcm_decrypt(sess.enc_key, row["title_nonce"], row["title_ct"], aad=aad).decode(),
-        "body": aesgcm_decrypt(sess.enc_key, row["body_nonce"], row["body_ct"], aad=aad).decode(),
+        "title": aead_decrypt(sess.enc_cipher, row["title_nonce"], row["title_ct"], aad=aad).decode(),
+        "body": aead_decrypt(sess.enc_cipher, row["body_nonce"], row["body_ct"], aad=aad).decode(),
         "is_favorite": bool(row["is_favorite"]),
         "word_count": row["word_count"] or 0,
         "notebook_id": row["notebook_id"],
@@ -600,11 +776,13 @@ async def get_entry_full(sess: SessionKeys, entry_id: int) -> dict:
     }
 
     if row["map_ct"]:
-        result["map_text"] = aesgcm_decrypt(sess.enc_key, row["map_nonce"], row["map_ct"], aad=aad).decode()
+        result["map_text"], result["map_format"] = _open_map(
+            sess, row["map_nonce"], row["map_ct"], row["map_format"]
+        )
     if row["mood_ct"]:
-        result["mood"] = aesgcm_decrypt(sess.enc_key, row["mood_nonce"], row["mood_ct"], aad=aad).decode()
+        result["mood"] = aead_decrypt(sess.enc_cipher, row["mood_nonce"], row["mood_ct"], aad=aad).decode()
     if row["weather_ct"]:
-        result["weather"] = aesgcm_decrypt(sess.enc_key, row["weather_nonce"], row["weather_ct"], aad=aad).decode()
+        result["weather"] = aead_decrypt(sess.enc_cipher, row["weather_nonce"], row["weather_ct"], aad=aad).decode()
 
     return result
 
@@ -627,13 +805,16 @@ async def list_entries_in_range(
 ) -> List[Tuple[int, str, str, bool, int]]:
     """Return entries in date range: (id, created_at, title, is_favorite, word_count)."""
     rows = await db.list_entry_headers_in_range(sess.user_id, start, end, sort_asc)
-    out = []
-    for r in rows:
-        title = aesgcm_decrypt(
-            sess.enc_key, r["title_nonce"], r["title_ct"], aad=sess.username.encode()
-        ).decode()
-        out.append((r["id"], r["created_at"], title, bool(r["is_favorite"]), r["word_count"] or 0))
-    return out
+    titles = await asyncio.to_thread(
+        aead_decrypt_many,
+        sess.enc_cipher,
+        [(r["title_nonce"], r["title_ct"]) for r in rows],
+        aad=sess.username_bytes,
+    )
+    return [
+        (r["id"], r["created_at"], t.decode(), bool(r["is_favorite"]), r["word_count"] or 0)
+        for r, t in zip(rows, titles, strict=True)
+    ]
 
 
 async def list_entries_paginated(
@@ -645,18 +826,28 @@ async def list_entries_paginated(
 ) -> List[Tuple[int, str, str, bool, int, str]]:
     """Return paginated entries: (id, created_at, title, is_favorite, word_count, mood)."""
     rows = await db.list_entry_headers_sorted(sess.user_id, sort_asc, notebook_id, limit, offset)
-    aad = sess.username.encode()
-    out = []
-    for r in rows:
-        title = aesgcm_decrypt(sess.enc_key, r["title_nonce"], r["title_ct"], aad=aad).decode()
-        mood = ""
-        if r["mood_ct"]:
-            try:
-                mood = aesgcm_decrypt(sess.enc_key, r["mood_nonce"], r["mood_ct"], aad=aad).decode()
-            except Exception:
-                pass
-        out.append((r["id"], r["created_at"], title, bool(r["is_favorite"]), r["word_count"] or 0, mood))
-    return out
+    aad = sess.username_bytes
+
+    def _decrypt_page() -> List[Tuple[str, str]]:
+        # Titles and moods in one worker pass with the session's cipher
+        decrypt = sess.enc_cipher.decrypt
+        fields = []
+        for r in rows:
+            title = decrypt(r["title_nonce"], r["title_ct"], aad).decode()
+            mood = ""
+            if r["mood_ct"]:
+                try:
+                    mood = decrypt(r["mood_nonce"], r["mood_ct"], aad).decode()
+                except Exception:
+                    pass
+            fields.append((title, mood))
+        return fields
+
+    fields = await asyncio.to_thread(_decrypt_page)
+    return [
+        (r["id"], r["created_at"], title, bool(r["is_favorite"]), r["word_count"] or 0, mood)
+        for r, (title, mood) in zip(rows, fields, strict=True)
+    ]
 
 
 async def count_entries(sess: SessionKeys, notebook_id: int | None = None) -> int:
@@ -673,8 +864,8 @@ async def add_tag(sess: SessionKeys, entry_id: int, tag: str) -> int:
     tag = tag.strip().lower()
     if not tag:
         raise ValueError("Tag cannot be empty")
-    aad = sess.username.encode()
-    tag_nonce, tag_ct = aesgcm_encrypt(sess.enc_key, tag.encode(), aad=aad)
+    aad = sess.username_bytes
+    tag_nonce, tag_ct = aead_encrypt(sess.enc_cipher, tag.encode(), aad=aad)
     tag_hash = hmac_token(sess.search_key, f"tag:{tag}")
     return await db.insert_entry_tag(entry_id, tag_nonce, tag_ct, tag_hash)
 
@@ -687,9 +878,9 @@ async def remove_tag(sess: SessionKeys, tag_id: int) -> None:
 async def list_tags(sess: SessionKeys, entry_id: int) -> List[Tuple[int, str]]:
     """Return list of (tag_id, decrypted_tag) for an entry."""
     rows = await db.get_tags_for_entry(entry_id)
-    aad = sess.username.encode()
+    aad = sess.username_bytes
     return [
-        (r["id"], aesgcm_decrypt(sess.enc_key, r["tag_nonce"], r["tag_ct"], aad=aad).decode())
+        (r["id"], aead_decrypt(sess.enc_cipher, r["tag_nonce"], r["tag_ct"], aad=aad).decode())
         for r in rows
     ]
 
@@ -714,12 +905,12 @@ async def set_mood_weather(
     sess: SessionKeys, entry_id: int, mood: str = "", weather: str = ""
 ) -> None:
     """Set encrypted mood and weather on an entry."""
-    aad = sess.username.encode()
+    aad = sess.username_bytes
     mood_nonce = mood_ct = weather_nonce = weather_ct = None
     if mood:
-        mood_nonce, mood_ct = aesgcm_encrypt(sess.enc_key, mood.encode(), aad=aad)
+        mood_nonce, mood_ct = aead_encrypt(sess.enc_cipher, mood.encode(), aad=aad)
     if weather:
-        weather_nonce, weather_ct = aesgcm_encrypt(sess.enc_key, weather.encode(), aad=aad)
+        weather_nonce, weather_ct = aead_encrypt(sess.enc_cipher, weather.encode(), aad=aad)
     await db.update_entry_mood_weather(
         entry_id, sess.user_id,
         mood_nonce, mood_ct, weather_nonce, weather_ct,
@@ -734,8 +925,8 @@ async def create_notebook(sess: SessionKeys, name: str) -> int:
     """Create a new encrypted notebook. Returns notebook id."""
     if not name.strip():
         raise ValueError("Notebook name cannot be empty")
-    aad = sess.username.encode()
-    name_nonce, name_ct = aesgcm_encrypt(sess.enc_key, name.encode(), aad=aad)
+    aad = sess.username_bytes
+    name_nonce, name_ct = aead_encrypt(sess.enc_cipher, name.encode(), aad=aad)
     created_at = datetime.now(timezone.utc).isoformat()
     return await db.insert_notebook(sess.user_id, name_nonce, name_ct, created_at)
 
@@ -743,9 +934,9 @@ async def create_notebook(sess: SessionKeys, name: str) -> int:
 async def list_notebooks(sess: SessionKeys) -> List[Tuple[int, str]]:
     """Return list of (notebook_id, decrypted_name)."""
     rows = await db.list_notebooks(sess.user_id)
-    aad = sess.username.encode()
+    aad = sess.username_bytes
     return [
-        (r["id"], aesgcm_decrypt(sess.enc_key, r["name_nonce"], r["name_ct"], aad=aad).decode())
+        (r["id"], aead_decrypt(sess.enc_cipher, r["name_nonce"], r["name_ct"], aad=aad).decode())
         for r in rows
     ]
 
@@ -768,9 +959,9 @@ async def create_template(sess: SessionKeys, name: str, title: str, body: str) -
     """Create an encrypted entry template."""
     if not name.strip():
         raise ValueError("Template name cannot be empty")
-    aad = sess.username.encode()
-    t_nonce, t_ct = aesgcm_encrypt(sess.enc_key, title.encode(), aad=aad)
-    b_nonce, b_ct = aesgcm_encrypt(sess.enc_key, body.encode(), aad=aad)
+    aad = sess.username_bytes
+    t_nonce, t_ct = aead_encrypt(sess.enc_cipher, title.encode(), aad=aad)
+    b_nonce, b_ct = aead_encrypt(sess.enc_cipher, body.encode(), aad=aad)
     created_at = datetime.now(timezone.utc).isoformat()
     return await db.insert_template(sess.user_id, name, t_nonce, t_ct, b_nonce, b_ct, created_at)
 
@@ -786,9 +977,9 @@ async def get_template(sess: SessionKeys, template_id: int) -> Tuple[str, str, s
     row = await db.get_template(template_id, sess.user_id)
     if not row:
         raise ValueError("Template not found")
-    aad = sess.username.encode()
-    title = aesgcm_decrypt(sess.enc_key, row["title_nonce"], row["title_ct"], aad=aad).decode()
-    body = aesgcm_decrypt(sess.enc_key, row["body_nonce"], row["body_ct"], aad=aad).decode()
+    aad = sess.username_bytes
+    title = aead_decrypt(sess.enc_cipher, row["title_nonce"], row["title_ct"], aad=aad).decode()
+    body = aead_decrypt(sess.enc_cipher, row["body_nonce"], row["body_ct"], aad=aad).decode()
     return row["name"], title, body
 
 
@@ -815,14 +1006,18 @@ async def export_entries(sess: SessionKeys, fmt: str = "json") -> str:
     """Export all entries as JSON or Markdown string."""
     entries = []
     rows = await db.list_entry_rows_for_user(sess.user_id)
-    aad = sess.username.encode()
-    for r in rows:
-        title = aesgcm_decrypt(sess.enc_key, r["title_nonce"], r["title_ct"], aad=aad).decode()
-        body = aesgcm_decrypt(sess.enc_key, r["body_nonce"], r["body_ct"], aad=aad).decode()
+    aad = sess.username_bytes
+    titles = await asyncio.to_thread(
+        aead_decrypt_many, sess.enc_cipher, [(r["title_nonce"], r["title_ct"]) for r in rows], aad=aad
+    )
+    bodies = await asyncio.to_thread(
+        aead_decrypt_many, sess.enc_cipher, [(r["body_nonce"], r["body_ct"]) for r in rows], aad=aad
+    )
+    for r, title, body in zip(rows, titles, bodies, strict=True):
         entries.append({
             "created_at": r["created_at"],
-            "title": title,
-            "body": body,
+            "title": title.decode(),
+            "body": body.decode(),
         })
 
     if fmt == "markdown":
@@ -859,9 +1054,9 @@ async def save_draft(
     sess: SessionKeys, title: str, body: str, entry_id: int | None = None
 ) -> int:
     """Save or update a draft."""
-    aad = sess.username.encode()
-    t_nonce, t_ct = aesgcm_encrypt(sess.enc_key, title.encode(), aad=aad)
-    b_nonce, b_ct = aesgcm_encrypt(sess.enc_key, body.encode(), aad=aad)
+    aad = sess.username_bytes
+    t_nonce, t_ct = aead_encrypt(sess.enc_cipher, title.encode(), aad=aad)
+    b_nonce, b_ct = aead_encrypt(sess.enc_cipher, body.encode(), aad=aad)
     saved_at = datetime.now(timezone.utc).isoformat()
     return await db.upsert_draft(sess.user_id, entry_id, t_nonce, t_ct, b_nonce, b_ct, saved_at)
 
@@ -871,9 +1066,9 @@ async def get_draft(sess: SessionKeys, entry_id: int | None = None) -> Tuple[str
     row = await db.get_draft(sess.user_id, entry_id)
     if not row:
         return None
-    aad = sess.username.encode()
-    title = aesgcm_decrypt(sess.enc_key, row["title_nonce"], row["title_ct"], aad=aad).decode()
-    body = aesgcm_decrypt(sess.enc_key, row["body_nonce"], row["body_ct"], aad=aad).decode()
+    aad = sess.username_bytes
+    title = aead_decrypt(sess.enc_cipher, row["title_nonce"], row["title_ct"], aad=aad).decode()
+    body = aead_decrypt(sess.enc_cipher, row["body_nonce"], row["body_ct"], aad=aad).decode()
     return title, body
 
 
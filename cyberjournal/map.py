@@ -1,4 +1,4 @@
-import re, hashlib, math
+import re, hashlib, heapq, math
 from collections import Counter
 from typing import List, Tuple, Dict, Optional
 
@@ -12,10 +12,25 @@ ALL_OPEN = N | S | W | E  # 15
 def _u32(x: bytes) -> int:
     return int.from_bytes(x[:4], 'big', signed=False)
 
+_MASK64 = (1 << 64) - 1
+
+def _splitmix64(z: int) -> int:
+    """SplitMix64 finalizer: cheap, well-mixed 64-bit integer hash."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
 def rand01(seed: int, *nums: int) -> float:
     """Deterministic float in [0,1) from seed and coordinates."""
-    h = hashlib.sha256(f"{seed}|{','.join(map(str, nums))}".encode()).digest()
-    return _u32(h) / 2**32
+    h = seed & _MASK64
+    for n in nums:
+        h = _splitmix64((h + 0x9E3779B97F4A7C15 + n) & _MASK64)
+    return (h >> 11) * 2.0**-53
+
+def lattice01(seed: int, ix: int, iy: int) -> float:
+    """rand01 specialised to one (x, y) lattice point: a single SplitMix64 round."""
+    z = (seed + ix * 0x9E3779B97F4A7C15 + iy * 0xC2B2AE3D27D4EB4F) & _MASK64
+    return (_splitmix64(z) >> 11) * 2.0**-53
 
 def text_seed(text: str) -> int:
     return int(hashlib.sha256(text.encode()).hexdigest()[:16], 16)
@@ -28,16 +43,8 @@ def noise(seed: int, x: float, y: float, scale: float = 12.0, octaves: int = 3,
     Hash-based, cheap 'value noise'. Not true Perlin, but good enough for maps.
     Returns value in [0,1).
     """
-    def base(ix: int, iy: int) -> float:
-        return rand01(seed, ix, iy)
-
-    def lerp(a: float, b: float, t: float) -> float:
-        return a + (b - a) * t
-
-    def smooth(t: float) -> float:
-        # classic fade curve for smoother interpolation
-        return t * t * (3 - 2 * t)
-
+    # Lerp and fade curve inlined (same arithmetic as noise_field, so the two
+    # stay bit-identical) to avoid rebuilding closures on every call.
     total = 0.0
     amp = 1.0
     freq = 1.0
@@ -46,20 +53,67 @@ def noise(seed: int, x: float, y: float, scale: float = 12.0, octaves: int = 3,
         sx = (x / scale) * freq
         sy = (y / scale) * freq
         x0, y0 = math.floor(sx), math.floor(sy)
-        tx, ty = smooth(sx - x0), smooth(sy - y0)
-        v00 = base(x0, y0)
-        v10 = base(x0 + 1, y0)
-        v01 = base(x0, y0 + 1)
-        v11 = base(x0 + 1, y0 + 1)
-        vx0 = lerp(v00, v10, tx)
-        vx1 = lerp(v01, v11, tx)
-        vxy = lerp(vx0, vx1, ty)
-        total += vxy * amp
+        tx, ty = sx - x0, sy - y0
+        tx = tx * tx * (3 - 2 * tx)
+        ty = ty * ty * (3 - 2 * ty)
+        v00 = lattice01(seed, x0, y0)
+        v10 = lattice01(seed, x0 + 1, y0)
+        v01 = lattice01(seed, x0, y0 + 1)
+        v11 = lattice01(seed, x0 + 1, y0 + 1)
+        vx0 = v00 + (v10 - v00) * tx
+        vx1 = v01 + (v11 - v01) * tx
+        total += (vx0 + (vx1 - vx0) * ty) * amp
         norm += amp
         amp *= persistence
         freq *= 2.0
     return total / max(norm, 1e-9)
 
+def noise_field(seed: int, w: int, h: int, *, scale: float = 12.0, octaves: int = 3,
+                persistence: float = 0.5, x_off: int = 0, y_off: int = 0) -> List[List[float]]:
+    """
+    Evaluate noise() over a w x h grid at (x + x_off, y + y_off); returns rows.
+    Same values as calling noise() per cell, but each octave hashes its lattice
+    corners once and the per-column/per-row interpolation terms are shared.
+    """
+    total = [[0.0] * w for _ in range(h)]
+    if w <= 0 or h <= 0:
+        return total
+
+    def axis(n: int, off: int, freq: float) -> List[Tuple[int, float]]:
+        out = []
+        for i in range(n):
+            s = ((i + off) / scale) * freq
+            i0 = math.floor(s)
+            t = s - i0
+            out.append((i0, t * t * (3 - 2 * t)))
+        return out
+
+    amp = 1.0
+    freq = 1.0
+    norm = 0.0
+    for _ in range(octaves):
+        cols = axis(w, x_off, freq)
+        rows = axis(h, y_off, freq)
+        xmin, ymin = cols[0][0], rows[0][0]
+        xs = range(xmin, cols[-1][0] + 2)
+        corners = [[lattice01(seed, ix, iy) for ix in xs] for iy in range(ymin, rows[-1][0] + 2)]
+        for y, (y0, ty) in enumerate(rows):
+            c0 = corners[y0 - ymin]
+            c1 = corners[y0 - ymin + 1]
+            acc = total[y]
+            for x, (x0, tx) in enumerate(cols):
+                i = x0 - xmin
+                v00, v10 = c0[i], c0[i + 1]
+                v01, v11 = c1[i], c1[i + 1]
+                vx0 = v00 + (v10 - v00) * tx
+                vx1 = v01 + (v11 - v01) * tx
+                acc[x] += (vx0 + (vx1 - vx0) * ty) * amp
+        norm += amp
+        amp *= persistence
+        freq *= 2.0
+    norm = max(norm, 1e-9)
+    return [[v / norm for v in row] for row in total]
+
 # -------------------------
 # Terrain classification
 # -------------------------
@@ -99,16 +153,23 @@ def classify(elev: float, moist: float) -> str:
         return "forest"
     return "field"
 
+def classify_field(elev_map: List[List[float]], moist_map: List[List[float]]) -> List[List[str]]:
+    """classify() over whole rows; map() keeps the per-cell dispatch in C."""
+    return [list(map(classify, erow, mrow)) for erow, mrow in zip(elev_map, moist_map, strict=True)]
+
 # -------------------------
 # Text → POIs
 # -------------------------
+_WORD_RE = re.compile(r"[A-Za-z']{3,}")
+_WORD_ANY_RE = re.compile(r"[A-Za-z']+")
+_STOPWORDS = frozenset("""
+    the and you for that with have this not but are was from your they his her she him our out were about would could should there their them into over under
+    of to in on a an is it as by be or if at we i me my ours ours us he she this those these while when where which who whom whose than then than
+""".split())
+
 def top_keywords(text: str, k: int = 3) -> List[str]:
-    words = re.findall(r"[A-Za-z']{3,}", text.lower())
-    stop = set("""
-        the and you for that with have this not but are was from your they his her she him our out were about would could should there their them into over under
-        of to in on a an is it as by be or if at we i me my ours ours us he she this those these while when where which who whom whose than then than
-    """.split())
-    c = Counter(w for w in words if w not in stop and len(w) >= 4)
+    words = _WORD_RE.findall(text.lower())
+    c = Counter(w for w in words if w not in _STOPWORDS and len(w) >= 4)
     return [w for w, _ in c.most_common(k)]
 
 def place_symbol(seed: int, w: int, h: int, label: str) -> Tuple[int,int]:
@@ -125,20 +186,25 @@ def place_symbol(seed: int, w: int, h: int, label: str) -> Tuple[int,int]:
 def carve_river(grid_types: List[List[str]], elev_map: List[List[float]], seed: int, max_rivers: int = 2):
     h, w = len(grid_types), len(grid_types[0])
     # candidates: high elevation sources not on border
-    candidates = [(elev_map[y][x], x, y)
-                  for y in range(1, h-1) for x in range(1, w-1)
-                  if elev_map[y][x] > 0.75]
+    candidates = [(e, x, y)
+                  for y in range(1, h-1)
+                  for x, e in enumerate(elev_map[y][1:w-1], start=1)
+                  if e > 0.75]
     if not candidates:
         return
-    # pick up to max_rivers sources deterministically
-    candidates.sort(reverse=True)
+    # pick up to max_rivers sources deterministically; only the top 8 matter,
+    # so avoid sorting every high cell
     picks = []
-    for i, (_, x, y) in enumerate(candidates[:8]):
+    for i, (_, x, y) in enumerate(heapq.nlargest(8, candidates)):
         if len(picks) >= max_rivers: break
         # spread them deterministically
         if i % 3 == 0 or not picks:
             picks.append((x, y))
-    # flow
+    # flow; elevation padded with an +inf border (pad[y+1][x+1] == elev_map[y][x])
+    # so the neighbour scan needs no bounds checks: +inf never wins or ties
+    inf = float("inf")
+    edge = [inf] * (w + 2)
+    pad = [edge] + [[inf, *row, inf] for row in elev_map] + [edge]
     for sx, sy in picks:
         x, y = sx, sy
         seen = set()
@@ -151,12 +217,12 @@ def carve_river(grid_types: List[List[str]], elev_map: List[List[float]], seed:
             grid_types[y][x] = "river"
             # choose lowest neighbor (N,S,E,W) with deterministic tie-break
             best = None
-            best_e = elev_map[y][x]
-            for nx, ny in [(x, y-1), (x, y+1), (x-1, y), (x+1, y)]:
-                if 0 <= nx < w and 0 <= ny < h:
-                    e = elev_map[ny][nx]
-                    if e < best_e or (abs(e-best_e) < 1e-9 and rand01(seed, x, y, nx, ny) < 0.5):
-                        best_e, best = e, (nx, ny)
+            above, here, below = pad[y], pad[y+1], pad[y+2]
+            best_e = here[x+1]
+            for nx, ny, e in ((x, y-1, above[x+1]), (x, y+1, below[x+1]),
+                              (x-1, y, here[x]), (x+1, y, here[x+2])):
+                if e < best_e or (abs(e-best_e) < 1e-9 and rand01(seed, x, y, nx, ny) < 0.5):
+                    best_e, best = e, (nx, ny)
             if best is None:
                 break
             x, y = best
@@ -164,7 +230,18 @@ def carve_river(grid_types: List[List[str]], elev_map: List[List[float]], seed:
 # -------------------------
 # Main: text -> terrain map
 # -------------------------
-def text_to_map(text: str, width: Optional[int] = None, height: Optional[int] = None):
+def terrain_fields(seed: int, w: int, h: int) -> Tuple[List[List[float]], List[List[float]]]:
+    """Elevation and moisture fields for a text seed; returns (elev_map, moist_map)."""
+    # jitter scale based on seed so different texts "feel" different
+    scale_e = 8.0 + (seed % 97) * 0.2
+    scale_m = 10.0 + ((seed >> 16) % 89) * 0.25
+    elev_map = noise_field(seed ^ 0xA57E, w, h, scale=scale_e, octaves=4, persistence=0.55)
+    moist_map = noise_field(seed ^ 0xBEEF, w, h, scale=scale_m, octaves=3, persistence=0.6,
+                            x_off=1000, y_off=-777)
+    return elev_map, moist_map
+
+def text_to_map(text: str, width: Optional[int] = None, height: Optional[int] = None, *,
+                fields: Optional[Tuple[List[List[float]], List[List[float]]]] = None):
     """
     Produce:
       - openings: 2D bitmask grid (topology; here fully open = 15)
@@ -172,9 +249,11 @@ def text_to_map(text: str, width: Optional[int] = None, height: Optional[int] =
       - costs:    2D numeric movement costs
       - legend:   dict(symbol->meaning) and poi mapping
     Size auto-derives from text length unless specified.
+    Pass *fields* (from terrain_fields for this text's seed and size) to reuse
+    already-computed elevation/moisture instead of evaluating the noise again.
     """
     seed = text_seed(text)
-    words = max(1, len(re.findall(r"[A-Za-z']+", text)))
+    words = max(1, len(_WORD_ANY_RE.findall(text)))
     # auto size from text length (tweak as desired)
     side = max(16, min(64, int(4 + math.sqrt(words) * 2.5)))
     w = width or side
@@ -183,26 +262,17 @@ def text_to_map(text: str, width: Optional[int] = None, height: Optional[int] =
     openings = [[ALL_OPEN for _ in range(w)] for _ in range(h)]
 
     # elevation & moisture fields
-    elev_map = [[0.0]*w for _ in range(h)]
-    moist_map = [[0.0]*w for _ in range(h)]
-    for y in range(h):
-        for x in range(w):
-            # jitter scale based on seed so different texts "feel" different
-            scale_e = 8.0 + (seed % 97) * 0.2
-            scale_m = 10.0 + ((seed >> 16) % 89) * 0.25
-            elev = noise(seed ^ 0xA57E, x, y, scale=scale_e, octaves=4, persistence=0.55)
-            moist = noise(seed ^ 0xBEEF, x+1000, y-777, scale=scale_m, octaves=3, persistence=0.6)
-            elev_map[y][x] = elev
-            moist_map[y][x] = moist
+    elev_map, moist_map = fields if fields is not None else terrain_fields(seed, w, h)
 
     # classify tiles
-    types = [[classify(elev_map[y][x], moist_map[y][x]) for x in range(w)] for y in range(h)]
+    types = classify_field(elev_map, moist_map)
 
     # carve rivers after classification
     carve_river(types, elev_map, seed, max_rivers=2)
 
-    # assign costs from types
-    costs = [[TERRAIN_COST.get(types[y][x], 1) for x in range(w)] for y in range(h)]
+    # assign costs from types (walk rows directly rather than double-indexing)
+    cost_of = TERRAIN_COST.get
+    costs = [[cost_of(t, 1) for t in row] for row in types]
 
     # POIs from keywords
     kws = top_keywords(text, k=3)
@@ -226,15 +296,9 @@ def text_to_map(text: str, width: Optional[int] = None, height: Optional[int] =
 # ASCII rendering
 # -------------------------
 def render_ascii(types: List[List[str]], legend: Dict) -> str:
-    h, w = len(types), len(types[0])
     sym = {k: v for k, v in legend["tiles"].items()}
-    out = []
-    for y in range(h):
-        row = []
-        for x in range(w):
-            t = types[y][x]
-            row.append(sym.get(t, '?'))
-        out.append("".join(row))
+    glyph = sym.get
+    out = ["".join([glyph(t, '?') for t in row]) for row in types]
     # legend footer
     lines = ["\nLegend: ~ water  , shore  . field  T forest  ^ hill  A mountain  = river  * poi"]
     if legend["keywords"]:
@@ -321,7 +385,7 @@ def render_colored_map(
     - types: 2D list of terrain strings (water/shore/field/forest/hill/mount/river/road/poi)
     - legend: optional dict returned by your generator; used to show seed/keywords
     """
-    h, w = len(types), len(types[0])
+    w = len(types[0])
     sym = SYMBOLS_UTF if charset.lower() == "utf" else SYMBOLS_ASCII
 
     # border chars
@@ -342,13 +406,13 @@ def render_colored_map(
     if border:
         lines.append(TL + (H * w) + TR)
 
-    for y in range(h):
-        row_chars = []
-        for x in range(w):
-            t = types[y][x]
-            ch = sym.get(t, "?")
-            row_chars.append(paint(t, ch))
-        row = "".join(row_chars)
+    # Paint each known tile once up front; unknown tiles all share one cell.
+    cells = {t: paint(t, ch) for t, ch in sym.items()}
+    unknown_cell = paint("unknown", "?")
+    cell = cells.get
+
+    for types_row in types:
+        row = "".join([cell(t, unknown_cell) for t in types_row])
         if border:
             lines.append(f"{V}{row}{V}")
         else:
@@ -22,7 +22,6 @@ from textual.timer import Timer
 from textual.widgets import (
     Button,
     Footer,
-    Header,
     Input,
     Label,
     ListItem,
@@ -39,6 +38,7 @@ logger = logging.getLogger(__name__)
 
 from cyberjournal.logic import (  # type: ignore
     SessionKeys,
+    config_flag,
     load_config,
     save_config,
     init_db,
@@ -49,11 +49,13 @@ from cyberjournal.logic import (  # type: ignore
     reset_password_with_security_answer,
     add_entry,
     list_entries,
+    list_entries_by_ids,
     get_entry,
     search_entries,
     update_entry,
     delete_entry,
     get_entry_with_map,
+    clear_map_cache,
     get_entry_full,
     toggle_favorite,
     list_entries_paginated,
@@ -79,9 +81,12 @@ from cyberjournal.logic import (  # type: ignore
     get_draft,
     list_entries_in_range,
 )
+from cyberjournal.widgets import busy, screen_chrome
 from cyberjournal.world.explorer import WorldExplorerScreen
 
 THEME_CSS_PATH = str(Path(__file__).with_name("theme.css"))
+# Read once at import and handed to Textual as inline CSS
+THEME_CSS = Path(THEME_CSS_PATH).read_text(encoding="utf-8")
 
 PAGE_SIZE = 20
 
@@ -90,16 +95,31 @@ PAGE_SIZE = 20
 # Helpers
 # ---------------------------------------------------------------------------
 
+# Config theme key -> App CSS class
+THEME_CLASSES = {
+    "vt220_green": "theme-vt220",
+    "as400_amber": "theme-amber",
+    "vector_neon": "theme-neon",
+}
+
+
 def _apply_app_theme(app: App, theme_key: str) -> None:
-    valid = {
-        "vt220_green": "theme-vt220",
-        "as400_amber": "theme-amber",
-        "vector_neon": "theme-neon",
-    }
-    target = valid.get(theme_key, "theme-vt220")
-    for cls in ("theme-vt220", "theme-amber", "theme-neon"):
-        app.set_class(False, cls)
-    app.set_class(True, target)
+    target = THEME_CLASSES.get(theme_key, "theme-vt220")
+    current = [cls for cls in THEME_CLASSES.values() if app.has_class(cls)]
+    if current == [target]:
+        return
+    # Each class change restyles the whole app; drop the old theme silently
+    # so switching costs a single style update.
+    app.remove_class(*current, update=False)
+    app.add_class(target)
+
+
+class EntryItem(ListItem):
+    """A list row that carries the journal entry id it opens."""
+
+    def __init__(self, eid: int, label: str) -> None:
+        super().__init__(Label(label))
+        self.eid = eid
 
 
 # ---------------------------------------------------------------------------
@@ -109,40 +129,44 @@ def _apply_app_theme(app: App, theme_key: str) -> None:
 class SettingsModal(ModalScreen[None]):
     """Settings: theme choice + ASCII background text."""
 
+    # (button id, theme key, label) for the theme picker row
+    THEME_BUTTON_SPECS = (
+        ("t_green", "vt220_green", "VT220 GREEN"),
+        ("t_amber", "as400_amber", "AS/400 AMBER"),
+        ("t_neon", "vector_neon", "VECTOR NEON"),
+    )
+    # Button id -> theme key
+    THEME_BUTTONS = {bid: key for bid, key, _ in THEME_BUTTON_SPECS}
+
     def compose(self) -> ComposeResult:
         cfg = load_config()
         active = str(cfg.get("active_theme", "vt220_green"))
-        ascii_enabled = bool(cfg.get("ascii_art_enabled", True))
+        ascii_enabled = config_flag(cfg, "ascii_art_enabled")
+        # Theme clicks preview live; only Save persists them
+        self._saved_theme = active
+        self._pending_theme = active
 
         yield Container(
             Static("SETTINGS", classes="title"),
             Static("Theme", classes="hint"),
-            Horizontal(
-                Button("VT220 GREEN", id="t_green", classes="-primary" if active == "vt220_green" else ""),
-                Button("AS/400 AMBER", id="t_amber", classes="-primary" if active == "as400_amber" else ""),
-                Button("VECTOR NEON", id="t_neon", classes="-primary" if active == "vector_neon" else ""),
-            ),
+            Horizontal(*(
+                Button(label, id=bid, classes="-primary" if key == active else "")
+                for bid, key, label in self.THEME_BUTTON_SPECS
+            )),
             Static("", classes="separator"),
             Horizontal(
                 Static("ASCII art background", classes="hint"),
                 Switch(value=ascii_enabled, id="ascii_toggle"),
             ),
-            TextArea(id="ascii_text", placeholder="Paste ASCII art here..."),
+            TextArea(str(cfg.get("ascii_art", "") or ""), id="ascii_text", placeholder="Paste ASCII art here..."),
             Horizontal(Button("Save", id="save", classes="-primary"), Button("Close", id="close")),
             id="narrow-card",
             classes="layer-ui",
         )
 
-    async def on_mount(self) -> None:
-        cfg = load_config()
-        ascii_text = cfg.get("ascii_art", "")
-        if ascii_text:
-            self.query_one("#ascii_text", TextArea).text = str(ascii_text)
-
     def _update_theme_buttons(self, active: str) -> None:
         """Update button styles to show which theme is active."""
-        mapping = {"vt220_green": "t_green", "as400_amber": "t_amber", "vector_neon": "t_neon"}
-        for key, btn_id in mapping.items():
+        for btn_id, key in self.THEME_BUTTONS.items():
             try:
                 btn = self.query_one(f"#{btn_id}", Button)
                 btn.set_class(key == active, "-primary")
@@ -150,31 +174,31 @@ class SettingsModal(ModalScreen[None]):
                 pass
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
-        cfg = load_config()
         bid = event.button.id or ""
-        if bid == "t_green":
-            cfg["active_theme"] = "vt220_green"
-        elif bid == "t_amber":
-            cfg["active_theme"] = "as400_amber"
-        elif bid == "t_neon":
-            cfg["active_theme"] = "vector_neon"
+        if bid in self.THEME_BUTTONS:
+            # Preview without touching the config file
+            self._pending_theme = self.THEME_BUTTONS[bid]
+            _apply_app_theme(self.app, self._pending_theme)
+            self._update_theme_buttons(self._pending_theme)
         elif bid == "save":
-            ascii_enabled = self.query_one("#ascii_toggle", Switch).value
-            ascii_text = self.query_one("#ascii_text", TextArea).text
-            cfg["ascii_art_enabled"] = ascii_enabled
-            cfg["ascii_art"] = ascii_text
-            save_config(cfg)
-            _apply_app_theme(self.app, str(cfg.get("active_theme", "vt220_green")))
+            cfg = load_config()
+            updated = dict(
+                cfg,
+                active_theme=self._pending_theme,
+                ascii_art_enabled=self.query_one("#ascii_toggle", Switch).value,
+                ascii_art=self.query_one("#ascii_text", TextArea).text,
+            )
+            # Saving unchanged settings leaves the file alone
+            if updated != cfg:
+                save_config(updated)
+                self.app.refresh_config_derived(updated)
             self.app.notify("Settings saved.")
             self.dismiss()
-            return
         elif bid == "close":
+            # Drop an unsaved preview
+            if self._pending_theme != self._saved_theme:
+                _apply_app_theme(self.app, self._saved_theme)
             self.dismiss()
-            return
-        # Theme button clicked — apply live without dismissing
-        save_config(cfg)
-        _apply_app_theme(self.app, str(cfg.get("active_theme", "vt220_green")))
-        self._update_theme_buttons(str(cfg.get("active_theme", "vt220_green")))
 
 
 class CreateUserModal(ModalScreen[None]):
@@ -212,7 +236,8 @@ class CreateUserModal(ModalScreen[None]):
                 self.app.notify("Security question and answer required")
                 return
             try:
-                await register_user(u, p, sq, sa)
+                with busy(event.button):
+                    await register_user(u, p, sq, sa)
                 self.app.notify("User created.")
                 self.dismiss()
             except Exception as exc:
@@ -276,7 +301,8 @@ class ResetPasswordModal(ModalScreen[None]):
                 self.app.notify("Invalid security answer or password")
                 return
             try:
-                await reset_password_with_security_answer(self.target_username, answer, p1)
+                with busy(event.button):
+                    await reset_password_with_security_answer(self.target_username, answer, p1)
                 self.app.notify("Password reset complete. Entries deleted.")
                 self.dismiss()
             except Exception as exc:
@@ -317,7 +343,8 @@ class ChangePasswordModal(ModalScreen[None]):
                 self.app.notify("Invalid password")
                 return
             try:
-                self.app.session = await change_password_logged_in(self.app.session, p0, p1)
+                with busy(event.button):
+                    self.app.session = await change_password_logged_in(self.app.session, p0, p1)
                 self.app.notify("Password updated.")
                 self.dismiss()
             except Exception as exc:
@@ -327,17 +354,22 @@ class ChangePasswordModal(ModalScreen[None]):
             self.dismiss()
 
 
-class EditEntryModal(ModalScreen[None]):
-    """Edit title/body of an entry."""
+class EditEntryModal(ModalScreen):
+    """Edit title/body of an entry; dismisses with "updated" after a save."""
     AUTO_DISMISS = False
 
-    def __init__(self, entry_id: int) -> None:
+    def __init__(self, entry_id: int, title: str | None = None, body: str | None = None) -> None:
+        """*title*/*body* may be passed in when the caller has already decrypted them."""
         super().__init__()
         self.entry_id = entry_id
+        self._prefill = (title, body) if title is not None and body is not None else None
 
     async def on_mount(self) -> None:
         try:
-            created_at, title, body = await get_entry(self.app.session, self.entry_id)
+            if self._prefill is not None:
+                title, body = self._prefill
+            else:
+                created_at, title, body = await get_entry(self.app.session, self.entry_id)
             self.query_one("#etitle", Input).value = title
             self.query_one("#ebody", TextArea).text = body
             self.set_focus(self.query_one("#etitle", Input))
@@ -369,7 +401,7 @@ class EditEntryModal(ModalScreen[None]):
             try:
                 await update_entry(self.app.session, self.entry_id, title, body)
                 self.app.notify("Entry updated")
-                self.dismiss()
+                self.dismiss("updated")
             except Exception as exc:
                 logger.exception("Entry update failed")
                 self.app.notify(str(exc))
@@ -469,10 +501,12 @@ class TagModal(ModalScreen[None]):
         if not tags:
             self.tag_list.append(ListItem(Label("No tags")))
             return
+        items = []
         for tag_id, tag_text in tags:
             li = ListItem(Label(f"  {tag_text}  [x]"))
             li.data = tag_id
-            self.tag_list.append(li)
+            items.append(li)
+        await self.tag_list.extend(items)
 
     async def _add_tag(self) -> None:
         tag_input = self.query_one("#tag_input", Input)
@@ -542,11 +576,13 @@ class NotebookModal(ModalScreen[None]):
         if not notebooks:
             self.nb_list.append(ListItem(Label("No notebooks yet — create one below.")))
             return
+        items = []
         for nb_id, name in notebooks:
             active = " (active)" if nb_id == self._current_filter else ""
             li = ListItem(Label(f"  {name}{active}"))
             li.data = {"id": nb_id, "name": name}
-            self.nb_list.append(li)
+            items.append(li)
+        await self.nb_list.extend(items)
         self._pending_delete = None
 
     async def _create_notebook(self) -> None:
@@ -639,10 +675,12 @@ class TemplateModal(ModalScreen[None]):
         if not templates:
             self.tpl_list.append(ListItem(Label("No templates")))
             return
+        items = []
         for tpl_id, name in templates:
             li = ListItem(Label(f"  {name}"))
             li.data = tpl_id
-            self.tpl_list.append(li)
+            items.append(li)
+        await self.tpl_list.extend(items)
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         bid = event.button.id or ""
@@ -811,6 +849,7 @@ class LoginScreen(Screen):
 
     BINDINGS = [Binding("escape", "app.quit", "Quit")]
     LAYERS = ("bg", "ui")
+    _logging_in = False
 
     def on_mount(self) -> None:
         self.set_focus(self.query_one("#username", Input))
@@ -819,10 +858,7 @@ class LoginScreen(Screen):
         self.call_after_refresh(self.set_focus, self.query_one("#username", Input))
 
     def compose(self) -> ComposeResult:
-        cfg = load_config()
-        if cfg.get("ascii_art_enabled", True) and cfg.get("ascii_art"):
-            yield Static(str(cfg.get("ascii_art")), id="ascii", classes="layer-bg", markup=False)
-        yield Header(classes="layer-ui")
+        yield from screen_chrome(self.app)
         yield Container(
             Static("CYBER//JOURNAL", classes="title"),
             Input(placeholder="username", id="username"),
@@ -842,24 +878,34 @@ class LoginScreen(Screen):
         )
         yield Footer(classes="layer-ui")
 
+    def _start_login(self) -> None:
+        """Run one login at a time, in a worker so repeat Enter/clicks are seen and dropped."""
+        if self._logging_in:
+            return
+        self._logging_in = True
+        self.run_worker(self._do_login())
+
     async def _do_login(self) -> None:
         username = self.query_one("#username", Input).value.strip()
         password = self.query_one("#password", Input).value
         try:
-            sess = await login_user(username, password)
+            with busy(self.query_one("#do_login", Button)):
+                sess = await login_user(username, password)
             self.app.session = sess
             await self.app.push_screen(JournalHomeScreen())
         except Exception as exc:
             self.app.notify(str(exc))
+        finally:
+            self._logging_in = False
 
-    async def on_input_submitted(self, event: Input.Submitted) -> None:
+    def on_input_submitted(self, event: Input.Submitted) -> None:
         if event.input.id in ("username", "password"):
-            await self._do_login()
+            self._start_login()
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         bid = event.button.id or ""
         if bid == "do_login":
-            await self._do_login()
+            self._start_login()
         elif bid == "exit":
             self.app.exit()
         elif bid == "open_settings":
@@ -878,21 +924,23 @@ class JournalHomeScreen(Screen):
         Binding("question_mark", "show_help", "Help"),
     ]
     LAYERS = ("bg", "ui")
+    MOOD_ICONS = {
+        "happy": "+", "sad": "-", "neutral": "~",
+        "anxious": "!", "energetic": "^", "calm": "=",
+    }
 
     def __init__(self) -> None:
         super().__init__()
         self._page = 0
         self._total = 0
+        # Set when a closed screen already patched the list in place
+        self._list_patched = False
         self._sort_asc = False
         self._notebook_filter: int | None = None
         self._auto_save_timer: Timer | None = None
 
     def compose(self) -> ComposeResult:
-        cfg = load_config()
-        if cfg.get("ascii_art_enabled", True) and cfg.get("ascii_art"):
-            yield Static(str(cfg.get("ascii_art")), id="ascii", classes="layer-bg", markup=False)
-
-        yield Header(classes="layer-ui")
+        yield from screen_chrome(self.app)
 
         with Container(id="modal-card", classes="layer-ui"):
             with TabbedContent():
@@ -1023,7 +1071,11 @@ class JournalHomeScreen(Screen):
         """Restore focus and refresh data when returning from a modal/screen."""
         if not self.app.session:
             return
-        await self.refresh_list()
+        if self._list_patched:
+            self._list_patched = False
+            self._update_page_info()
+        else:
+            await self.refresh_list()
         await self._refresh_notebook_select()
         await self._refresh_stats()
         # Restore focus to the list view (most common return target)
@@ -1056,6 +1108,22 @@ class JournalHomeScreen(Screen):
             limit=PAGE_SIZE,
             offset=self._page * PAGE_SIZE,
         )
+        self._update_page_info()
+
+        if not entries:
+            self.list_view.append(ListItem(Label("No entries yet. Create one in the New Entry tab!")))
+            return
+        # Mount the whole page at once: one layout pass instead of one per row
+        await self.list_view.extend(self._entry_item(entry) for entry in entries)
+
+    def _entry_item(self, entry: tuple) -> EntryItem:
+        """Build a Browse row from a list_entries_paginated tuple."""
+        eid, created_at, title, is_fav, wc, mood = entry
+        fav = "[FAV] " if is_fav else ""
+        mood_sym = f" ({self.MOOD_ICONS[mood]})" if mood in self.MOOD_ICONS else ""
+        return EntryItem(eid, f"{fav}{created_at[:10]} — {title}  [{wc}w]{mood_sym}")
+
+    def _update_page_info(self) -> None:
         max_page = max(0, (self._total - 1) // PAGE_SIZE)
         sort_dir = "ASC" if self._sort_asc else "DESC"
         nb_label = ""
@@ -1068,19 +1136,32 @@ class JournalHomeScreen(Screen):
         except Exception:
             pass
 
-        if not entries:
-            self.list_view.append(ListItem(Label("No entries yet. Create one in the New Entry tab!")))
-            return
-        mood_icons = {
-            "happy": "+", "sad": "-", "neutral": "~",
-            "anxious": "!", "energetic": "^", "calm": "=",
-        }
-        for eid, created_at, title, is_fav, wc, mood in entries:
-            fav = "[FAV] " if is_fav else ""
-            mood_sym = f" ({mood_icons.get(mood, '')})" if mood and mood in mood_icons else ""
-            item = ListItem(Label(f"{fav}{created_at[:10]} — {title}  [{wc}w]{mood_sym}"))
-            item.data = eid
-            self.list_view.append(item)
+    async def remove_entry(self, entry_id: int) -> None:
+        """Drop a deleted entry's rows from the live lists instead of re-querying the page.
+
+        A full page pulls up the first row of the next page in its place.
+        """
+        page_was_full = len(self.list_view.children) == PAGE_SIZE
+        on_page = False
+        for lv in (self.list_view, self.search_results):
+            for item in list(lv.children):
+                if isinstance(item, EntryItem) and item.eid == entry_id:
+                    on_page = on_page or lv is self.list_view
+                    await item.remove()
+        self._total = max(0, self._total - 1)
+        # Off-page deletes shift this page, and an emptied page needs its
+        # placeholder or an earlier page: both take a real refresh.
+        self._list_patched = on_page and bool(self.list_view.children)
+        if self._list_patched and page_was_full:
+            nxt = await list_entries_paginated(
+                self.app.session,
+                sort_asc=self._sort_asc,
+                notebook_id=self._notebook_filter,
+                limit=1,
+                offset=(self._page + 1) * PAGE_SIZE - 1,
+            )
+            if nxt:
+                await self.list_view.append(self._entry_item(nxt[0]))
 
     async def _refresh_calendar(self) -> None:
         """Render a text-based calendar for the current month."""
@@ -1105,9 +1186,12 @@ class JournalHomeScreen(Screen):
         self.cal_grid.update("\n".join(lines))
 
     async def on_list_view_selected(self, message: ListView.Selected) -> None:
-        eid = getattr(message.item, "data", None)
-        if eid is not None:
-            await self.app.push_screen(ViewEntryScreen(entry_id=eid))
+        if isinstance(message.item, EntryItem):
+            eid = message.item.eid
+            async def _on_closed(result: object) -> None:
+                if result == "deleted":
+                    await self.remove_entry(eid)
+            await self.app.push_screen(ViewEntryScreen(entry_id=eid), callback=_on_closed)
 
     async def on_input_submitted(self, event: Input.Submitted) -> None:
         if event.input == self.query_in:
@@ -1126,14 +1210,10 @@ class JournalHomeScreen(Screen):
         if not ids:
             self.search_results.append(ListItem(Label("No results.")))
             return
-        for eid in ids:
-            try:
-                created_at, title, _ = await get_entry(self.app.session, eid)
-            except Exception:
-                continue
-            li = ListItem(Label(f"{created_at[:10]} — {title}"))
-            li.data = eid
-            self.search_results.append(li)
+        rows = await list_entries_by_ids(self.app.session, ids)
+        await self.search_results.extend(
+            EntryItem(eid, f"{created_at[:10]} — {title}") for eid, created_at, title in rows
+        )
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         bid = event.button.id or ""
@@ -1241,6 +1321,7 @@ class JournalHomeScreen(Screen):
         def _on_result(result: object) -> None:
             if result == "logout":
                 self.app.session = None
+                clear_map_cache()
                 self.dismiss()
         await self.app.push_screen(ConfirmLogoutModal(has_unsaved=has_unsaved), callback=_on_result)
 
@@ -1248,7 +1329,7 @@ class JournalHomeScreen(Screen):
         await self._confirm_logout()
 
     async def action_show_help(self) -> None:
-        await self.app.push_screen(HelpModal())
+        await self.app.action_show_help()
 
 
 class ViewEntryScreen(Screen):
@@ -1263,13 +1344,10 @@ class ViewEntryScreen(Screen):
     def __init__(self, entry_id: int) -> None:
         super().__init__()
         self.entry_id = entry_id
+        self._title = ""
 
     def compose(self) -> ComposeResult:
-        cfg = load_config()
-        if cfg.get("ascii_art_enabled", True) and cfg.get("ascii_art"):
-            yield Static(str(cfg.get("ascii_art")), id="ascii", classes="layer-bg", markup=False)
-
-        yield Header(classes="layer-ui")
+        yield from screen_chrome(self.app)
 
         with Container(id="modal-card", classes="layer-ui"):
             self.title_label = Static("", classes="title")
@@ -1296,16 +1374,22 @@ class ViewEntryScreen(Screen):
         yield Footer(classes="layer-ui")
 
     async def on_mount(self) -> None:
+        if await self.reload_content():
+            self.set_focus(self.body_area)
+
+    async def reload_content(self) -> bool:
+        """Fill the labels, body and map from the stored entry; False if it failed."""
         try:
             entry = await get_entry_full(self.app.session, self.entry_id)
         except Exception as exc:
             logger.exception("Failed to load entry")
             self.app.notify(f"Could not load entry: {exc}")
             self.dismiss()
-            return
+            return False
 
+        self._title = entry["title"]
         star = "[FAV] " if entry["is_favorite"] else ""
-        self.title_label.update(f"{star} {entry['title']}")
+        self.title_label.update(f"{star} {self._title}")
 
         meta_parts = [f"Created: {entry['created_at'][:19]}"]
         meta_parts.append(f"Words: {entry['word_count']}")
@@ -1321,49 +1405,46 @@ class ViewEntryScreen(Screen):
             self.map_label.update(entry["map_text"])
         else:
             self.map_label.update("(no map)")
-
-        self.set_focus(self.body_area)
+        return True
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         bid = event.button.id or ""
         if bid == "back":
             self.dismiss()
         elif bid == "edit":
-            await self.app.push_screen(EditEntryModal(self.entry_id))
+            async def _on_edit_result(result: object) -> None:
+                # Refresh this screen in place rather than rebuilding it
+                if result == "updated":
+                    await self.reload_content()
+            await self.app.push_screen(
+                EditEntryModal(self.entry_id, title=self._title, body=self.body_area.text),
+                callback=_on_edit_result,
+            )
         elif bid == "delete":
             def _on_delete_result(result: object) -> None:
                 if result == "deleted":
-                    self.dismiss()
+                    self.dismiss("deleted")
             await self.app.push_screen(ConfirmDeleteModal(self.entry_id), callback=_on_delete_result)
         elif bid == "fav":
             try:
                 new_state = await toggle_favorite(self.app.session, self.entry_id)
                 star = "[FAV] " if new_state else ""
                 self.app.notify("Favorited" if new_state else "Unfavorited")
-                # Refresh title
-                entry = await get_entry_full(self.app.session, self.entry_id)
-                self.title_label.update(f"{star} {entry['title']}")
+                self.title_label.update(f"{star} {self._title}")
             except Exception as exc:
                 self.app.notify(str(exc))
         elif bid == "tags":
             await self.app.push_screen(TagModal(self.entry_id))
 
     async def on_screen_resume(self) -> None:
-        """Restore focus and refresh entry data when returning from a modal."""
-        try:
-            entry = await get_entry_full(self.app.session, self.entry_id)
-            star = "[FAV] " if entry["is_favorite"] else ""
-            self.title_label.update(f"{star} {entry['title']}")
-            self.body_area.text = entry["body"] or ""
-        except Exception:
-            pass
+        """Restore focus when returning from a modal (edits refresh via their callback)."""
         self.call_after_refresh(self.set_focus, self.body_area)
 
     async def action_go_back(self) -> None:
         self.dismiss()
 
     async def action_show_help(self) -> None:
-        await self.app.push_screen(HelpModal())
+        await self.app.action_show_help()
 
 
 # ---------------------------------------------------------------------------
@@ -1374,18 +1455,32 @@ class CyberJournalApp(App):
     """Textual App wrapper."""
 
     TITLE = "CYBER//JOURNAL"
-    CSS_PATH = THEME_CSS_PATH
+    CSS = THEME_CSS
     BINDINGS = [Binding("question_mark", "show_help", "Help", show=False)]
+    # Static modals: built on first open, then kept installed and re-shown
+    SCREENS = {"help": HelpModal}
     session: Optional[SessionKeys] = None
+    # Config-derived ASCII background, read by every screen's compose
+    ascii_visible: bool = False
+    ascii_text: str = ""
 
     async def on_mount(self) -> None:
         await init_db()
         cfg = load_config()
         _apply_app_theme(self, str(cfg.get("active_theme", "vt220_green")))
+        self.refresh_config_derived(cfg)
         await self.push_screen(LoginScreen())
 
+    def refresh_config_derived(self, cfg: Optional[dict] = None) -> None:
+        """Recompute the attributes screens read instead of the raw config."""
+        if cfg is None:
+            cfg = load_config()
+        self.ascii_text = str(cfg.get("ascii_art") or "")
+        self.ascii_visible = bool(self.ascii_text) and config_flag(cfg, "ascii_art_enabled")
+
     async def action_show_help(self) -> None:
-        await self.push_screen(HelpModal())
+        if not isinstance(self.screen, HelpModal):
+            await self.push_screen("help")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""Widgets shared by the journal and world screens."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from textual.app import App, ComposeResult
+from textual.widgets import Button, Header, Static
+
+
+def screen_chrome(app: App) -> ComposeResult:
+    """Yield the optional ASCII-art background layer and the header.
+
+    Textual widgets belong to a single parent, so each screen gets fresh
+    (cheap) widgets; the art comes from the app's ascii_visible/ascii_text,
+    which are derived from the config once rather than on every compose.
+    """
+    if getattr(app, "ascii_visible", False):
+        yield Static(app.ascii_text, id="ascii", classes="layer-bg", markup=False)
+    yield Header(classes="layer-ui")
+
+
+@contextmanager
+def busy(button: Button) -> Iterator[None]:
+    """Disable *button* while a slow (KDF-bound) action is awaited.
+
+    The hashing itself already runs in a worker thread, so the UI keeps
+    repainting; disabling the button stops repeat clicks from queueing a
+    second call behind the first. Other triggers (e.g. Enter in an Input)
+    need their own guard.
+    """
+    button.disabled = True
+    try:
+        yield
+    finally:
+        button.disabled = False
@@ -9,9 +9,10 @@ from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, Vertical
 from textual.screen import ModalScreen, Screen
-from textual.widgets import Footer, Header, Static
+from textual.widgets import Footer, Static
 
-from cyberjournal.logic import load_config, get_entry
+from cyberjournal.logic import get_entry
+from cyberjournal.widgets import screen_chrome
 from cyberjournal.world import world_db
 from cyberjournal.world.renderer import render_world_viewport, render_tile_info, build_minimap_overlay
 from cyberjournal.world.quests import get_active_quests, complete_quest_at
@@ -226,9 +227,10 @@ class LandmarkRestScreen(ModalScreen):
     async def on_mount(self) -> None:
         from cyberjournal.world.interactions import build_shrine_text
         excerpt = ""
-        if self.entity["entry_id"] and hasattr(self.app, "session") and self.app.session:
+        session = getattr(self.app, "session", None)
+        if self.entity["entry_id"] and session:
             try:
-                _, title, body = await get_entry(self.app.session, self.entity["entry_id"])
+                _, title, body = await get_entry(session, self.entity["entry_id"])
                 excerpt = body[:200] + "..." if len(body) > 200 else body
             except Exception:
                 pass
@@ -434,11 +436,7 @@ class WorldExplorerScreen(Screen):
         self.placing_structure: str | None = None
 
     def compose(self) -> ComposeResult:
-        cfg = load_config()
-        if cfg.get("ascii_art_enabled", True) and cfg.get("ascii_art"):
-            yield Static(str(cfg.get("ascii_art")), id="ascii", classes="layer-bg", markup=False)
-
-        yield Header(classes="layer-ui")
+        yield from screen_chrome(self.app)
 
         with Container(id="modal-card", classes="layer-ui"):
             yield Static("WORLD EXPLORER", classes="title")
@@ -459,10 +457,11 @@ class WorldExplorerScreen(Screen):
         await world_db.init_world_db()
         placements_raw = await world_db.get_meta("chunk_placements")
         if not placements_raw or placements_raw == "{}":
-            if hasattr(self.app, "session") and self.app.session:
+            session = getattr(self.app, "session", None)
+            if session:
                 try:
                     from cyberjournal.logic import rebuild_world
-                    count = await rebuild_world(self.app.session)
+                    count = await rebuild_world(session)
                     if count > 0:
                         self.notify(f"World generated from {count} existing entries")
                 except Exception:
@@ -806,11 +805,7 @@ class WorldHistoryScreen(Screen):
     LAYERS = ("bg", "ui")
 
     def compose(self) -> ComposeResult:
-        cfg = load_config()
-        if cfg.get("ascii_art_enabled", True) and cfg.get("ascii_art"):
-            yield Static(str(cfg.get("ascii_art")), id="ascii", classes="layer-bg", markup=False)
-
-        yield Header(classes="layer-ui")
+        yield from screen_chrome(self.app)
 
         with Container(id="modal-card", classes="layer-ui"):
             yield Static("WORLD HISTORY", classes="title")
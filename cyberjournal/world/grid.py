@@ -10,7 +10,7 @@ from __future__ import annotations
 import json
 from typing import Optional
 
-from cyberjournal.map import text_to_map, classify, noise, text_seed
+from cyberjournal.map import text_to_map, classify, terrain_fields, text_seed
 from cyberjournal.world.biomes import classify_biome
 from cyberjournal.world import world_db
 
@@ -108,9 +108,12 @@ async def generate_chunk(
     The chunk is placed at world coordinates (chunk_x * CHUNK_W, chunk_y * CHUNK_H).
     """
     text = f"{title}\n{body}".strip()
-    _, types, costs, legend = text_to_map(text, width=CHUNK_W, height=CHUNK_H)
+    # Evaluate the noise once and share it with text_to_map
+    elev_map, moist_map = terrain_fields(text_seed(text), CHUNK_W, CHUNK_H)
+    _, types, costs, legend = text_to_map(
+        text, width=CHUNK_W, height=CHUNK_H, fields=(elev_map, moist_map)
+    )
 
-    seed = text_seed(text)
     world_x_offset = chunk_x * CHUNK_W
     world_y_offset = chunk_y * CHUNK_H
 
@@ -118,10 +121,8 @@ async def generate_chunk(
     for y in range(CHUNK_H):
         for x in range(CHUNK_W):
             terrain = types[y][x]
-            scale_e = 8.0 + (seed % 97) * 0.2
-            scale_m = 10.0 + ((seed >> 16) % 89) * 0.25
-            elev = noise(seed ^ 0xA57E, x, y, scale=scale_e, octaves=4, persistence=0.55)
-            moist = noise(seed ^ 0xBEEF, x + 1000, y - 777, scale=scale_m, octaves=3, persistence=0.6)
+            elev = elev_map[y][x]
+            moist = moist_map[y][x]
             biome = classify_biome(terrain, elev, moist)
             tiles.append({
                 "x": world_x_offset + x,
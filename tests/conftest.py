@@ -25,6 +25,7 @@ async def fresh_db(tmp_path):
     db.DB_PATH = db_path
     await db.init_db()
     yield db_path
+    await db.close_db()
 
 
 @pytest.fixture
@@ -3,13 +3,23 @@
 from __future__ import annotations
 
 import pytest
+from cryptography.exceptions import InvalidTag
 from cyberjournal.crypto import (
     scrypt_kdf,
+    argon2_kdf,
+    derive_kek,
+    KDF_VERSION_SCRYPT,
+    KDF_VERSION_ARGON2ID,
     hkdf_derive,
     aesgcm_encrypt,
     aesgcm_decrypt,
+    aead_encrypt,
+    aead_decrypt,
+    aead_decrypt_many,
     normalize_tokens,
     hmac_token,
+    TERM_HASH_LEN,
+    hmac_tokens,
     PH,
 )
 
@@ -38,6 +48,23 @@ class TestScryptKdf:
         assert len(scrypt_kdf("pw", salt, 64)) == 64
 
 
+class TestArgon2Kdf:
+    def test_deterministic(self):
+        salt = b"0123456789abcdef"
+        assert argon2_kdf("password", salt) == argon2_kdf("password", salt)
+
+    def test_differs_from_scrypt(self):
+        salt = b"0123456789abcdef"
+        assert argon2_kdf("password", salt) != scrypt_kdf("password", salt)
+
+    def test_derive_kek_dispatch(self):
+        salt = b"0123456789abcdef"
+        assert derive_kek("pw", salt, KDF_VERSION_SCRYPT) == scrypt_kdf("pw", salt)
+        assert derive_kek("pw", salt, KDF_VERSION_ARGON2ID) == argon2_kdf("pw", salt)
+        with pytest.raises(ValueError):
+            derive_kek("pw", salt, 99)
+
+
 class TestHkdfDerive:
     def test_deterministic(self):
         key = b"x" * 32
@@ -86,6 +113,29 @@ class TestAesGcm:
         assert n1 != n2
 
 
+class TestSessionCipher:
+    def test_cipher_matches_key(self, mock_session):
+        nonce, ct = aead_encrypt(mock_session.enc_cipher, b"title", aad=b"testuser")
+        assert aesgcm_decrypt(mock_session.enc_key, nonce, ct, aad=b"testuser") == b"title"
+
+    def test_round_trip(self, mock_session):
+        nonce, ct = aead_encrypt(mock_session.enc_cipher, b"body")
+        assert aead_decrypt(mock_session.enc_cipher, nonce, ct) == b"body"
+
+    def test_decrypt_many(self, mock_session):
+        pairs = [aead_encrypt(mock_session.enc_cipher, p, aad=b"u") for p in (b"a", b"bb", b"")]
+        assert aead_decrypt_many(mock_session.enc_cipher, pairs, aad=b"u") == [b"a", b"bb", b""]
+
+    def test_username_bytes(self, mock_session):
+        assert mock_session.username_bytes == b"testuser"
+
+    def test_map_chacha_cipher_round_trip(self, mock_session):
+        nonce, ct = aead_encrypt(mock_session.map_chacha_cipher, b"map", aad=b"u")
+        assert aead_decrypt(mock_session.map_chacha_cipher, nonce, ct, aad=b"u") == b"map"
+        with pytest.raises(InvalidTag):
+            aead_decrypt(mock_session.enc_cipher, nonce, ct, aad=b"u")
+
+
 class TestTokenization:
     def test_basic(self):
         assert normalize_tokens("Hello World") == ["hello", "world"]
@@ -102,6 +152,15 @@ class TestTokenization:
         assert "café" in tokens
         assert "résumé" in tokens
 
+    def test_underscore_splits(self):
+        assert normalize_tokens("snake_case Word") == ["snake", "case", "word"]
+
+    def test_matches_lower_then_split(self):
+        import re
+        text = "İstanbul ŞEHİR straße Ünïcode_mix 42x"
+        expected = [p for p in re.split(r"[\W_]+", text.lower()) if p]
+        assert normalize_tokens(text) == expected
+
 
 class TestHmacToken:
     def test_deterministic(self):
@@ -121,6 +180,22 @@ class TestHmacToken:
         h2 = hmac_token(b"b" * 32, "hello")
         assert h1 != h2
 
+    def test_truncated_length(self):
+        assert len(hmac_token(b"k" * 32, "hello")) == TERM_HASH_LEN
+
+    def test_batch_matches_single(self):
+        key = b"k" * 32
+        tokens = ["hello", "world", "café"]
+        assert hmac_tokens(key, tokens) == [hmac_token(key, t) for t in tokens]
+
+    def test_batch_long_key(self):
+        key = b"L" * 100
+        assert hmac_tokens(key, ["x"]) == [hmac_token(key, "x")]
+
+    def test_batch_dedups(self):
+        key = b"k" * 32
+        assert hmac_tokens(key, ["a", "b", "a"]) == [hmac_token(key, "a"), hmac_token(key, "b")]
+
 
 class TestPasswordHasher:
     def test_hash_and_verify(self):
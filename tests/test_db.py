@@ -2,11 +2,138 @@
 """Tests for cyberjournal.db module."""
 from __future__ import annotations
 
+import asyncio
+import sqlite3
+
 import pytest
 from cyberjournal import db
 from cyberjournal.errors import DuplicateUserError
 
 
+class TestConnection:
+    async def test_connection_is_shared(self, fresh_db):
+        assert await db.get_conn() is await db.get_conn()
+
+    async def test_concurrent_first_open_shares_connection(self, fresh_db):
+        await db.close_db()
+        first, second = await asyncio.gather(db.get_conn(), db.get_conn())
+        assert first is second is await db.get_conn()
+        cur = await first.execute("SELECT 1")
+        assert (await cur.fetchone())[0] == 1
+
+    async def test_reopens_on_path_change(self, fresh_db, tmp_path):
+        first = await db.get_conn()
+        db.DB_PATH = str(tmp_path / "other.sqlite3")
+        second = await db.get_conn()
+        assert second is not first
+
+    async def test_connection_pragmas(self, fresh_db):
+        conn = await db.get_conn()
+        cur = await conn.execute("PRAGMA synchronous")
+        assert (await cur.fetchone())[0] == 1  # NORMAL
+        cur = await conn.execute("PRAGMA foreign_keys")
+        assert (await cur.fetchone())[0] == 1
+        cur = await conn.execute("PRAGMA cache_size")
+        assert (await cur.fetchone())[0] == -20000
+        cur = await conn.execute("PRAGMA journal_mode")
+        assert (await cur.fetchone())[0] == "wal"
+
+
+class TestBackup:
+    async def test_backup_to_snapshot(self, fresh_db, tmp_path):
+        await db.insert_user(
+            "bk", "h", b"s" * 16, b"w" * 16, b"n" * 12,
+            "q", "a", "2024-01-01T00:00:00",
+        )
+        target = tmp_path / "copy.sqlite3"
+        await db.backup_to(str(target))
+        with sqlite3.connect(target) as conn:
+            rows = conn.execute("SELECT username FROM users").fetchall()
+        assert rows == [("bk",)]
+
+    async def test_backup_to_old_sqlite_uses_backup_api(self, fresh_db, tmp_path, monkeypatch):
+        monkeypatch.setattr(db.sqlite3, "sqlite_version_info", (3, 26, 0))
+        target = tmp_path / "legacy.sqlite3"
+        await db.backup_to(str(target))
+        with sqlite3.connect(target) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM users").fetchone() == (0,)
+
+    async def test_backup_to_failure_propagates(self, fresh_db, tmp_path):
+        with pytest.raises(sqlite3.OperationalError):
+            await db.backup_to(str(tmp_path / "missing" / "copy.sqlite3"))
+
+
+class TestMigrations:
+    async def test_legacy_user_index_dropped(self, fresh_db):
+        conn = await db.get_conn()
+        await conn.execute("CREATE INDEX idx_entries_user ON entries(user_id)")
+        await conn.commit()
+        await db.migrate_db()
+        async with db._connect() as conn:
+            assert not await db._index_exists(conn, "idx_entries_user")
+            assert await db._index_exists(conn, "idx_entries_user_created")
+
+    async def test_legacy_terms_table_rebuilt(self, fresh_db):
+        await db.insert_user(
+            "legacy", "h", b"s" * 16, b"w" * 16, b"n" * 12,
+            "q", "a", "2024-01-01T00:00:00",
+        )
+        uid = (await db.get_user_by_username("legacy"))["id"]
+        eid = await db.insert_entry_row(uid, "2024-01-01", b"n" * 12, b"c" * 10, b"n" * 12, b"c" * 10)
+        conn = await db.get_conn()
+        await conn.executescript(
+            """
+            DROP TABLE entry_terms;
+            CREATE TABLE entry_terms (
+                entry_id INTEGER NOT NULL,
+                term_hash BLOB NOT NULL,
+                UNIQUE(entry_id, term_hash)
+            );
+            """
+        )
+        await conn.execute("INSERT INTO entry_terms VALUES (?, ?)", (eid, b"old_hash"))
+        await conn.commit()
+
+        await db.migrate_db()
+        async with db._connect() as conn:
+            assert not await db._terms_table_is_legacy(conn)
+        assert await db.get_entry_ids_for_term(b"old_hash") == [eid]
+
+    async def test_term_lookup_uses_primary_key(self, fresh_db):
+        conn = await db.get_conn()
+        await conn.execute("CREATE INDEX idx_terms_hash ON entry_terms(term_hash)")
+        await conn.commit()
+        await db.migrate_db()
+        async with db._connect() as conn:
+            assert not await db._index_exists(conn, "idx_terms_hash")
+            cur = await conn.execute(
+                "EXPLAIN QUERY PLAN SELECT entry_id FROM entry_terms WHERE term_hash = ?", (b"x",)
+            )
+            plan = " ".join(r[3] for r in await cur.fetchall())
+        assert "USING PRIMARY KEY" in plan
+
+    async def test_full_length_term_hashes_truncated(self, fresh_db):
+        await db.insert_user(
+            "legacy", "h", b"s" * 16, b"w" * 16, b"n" * 12,
+            "q", "a", "2024-01-01T00:00:00",
+        )
+        uid = (await db.get_user_by_username("legacy"))["id"]
+        eid = await db.insert_entry_row(uid, "2024-01-01", b"n" * 12, b"c" * 10, b"n" * 12, b"c" * 10)
+        full = b"h" * 32
+        await db.insert_entry_terms([(eid, full), (eid, b"h" * 31 + b"x")])
+        conn = await db.get_conn()
+        await conn.execute("PRAGMA user_version = 0")
+        await conn.commit()
+
+        await db.migrate_db()
+        assert await db.get_entry_ids_for_term(full[:db.TERM_HASH_LEN]) == [eid]
+        async with db._connect() as conn:
+            cur = await conn.execute("SELECT COUNT(*), MAX(length(term_hash)) FROM entry_terms")
+            assert tuple(await cur.fetchone()) == (1, db.TERM_HASH_LEN)
+            cur = await conn.execute("PRAGMA user_version")
+            assert (await cur.fetchone())[0] == db.SCHEMA_VERSION
+
+
 class TestUsers:
     async def test_insert_and_get_user(self, fresh_db):
         await db.insert_user(
@@ -50,6 +177,17 @@ class TestUsers:
         row = await db.get_user_security_question("charlie")
         assert row["security_question"] == "What color?"
 
+    async def test_login_row_omits_security_columns(self, fresh_db):
+        await db.insert_user(
+            "dana", "h", b"s" * 16, b"w" * 16, b"n" * 12,
+            "q", "answer_hash", "2024-01-01T00:00:00",
+        )
+        row = await db.get_user_by_username("dana")
+        assert "security_answer_hash" not in row.keys()
+        assert row["kek_version"] == 1
+        full = await db.get_user_full("dana")
+        assert full["security_answer_hash"] == "answer_hash"
+
 
 class TestEntries:
     async def test_insert_and_get(self, fresh_db):
@@ -127,6 +265,90 @@ class TestEntryTerms:
         ids = await db.get_entry_ids_for_term(b"term_hash_1")
         assert eid in ids
 
+    async def test_insert_terms_from_generator(self, fresh_db):
+        await db.insert_user(
+            "user5g", "h", b"s" * 16, b"w" * 16, b"n" * 12,
+            "q", "a", "2024-01-01T00:00:00",
+        )
+        uid = (await db.get_user_by_username("user5g"))["id"]
+        eid = await db.insert_entry_row(uid, "2024-01-01", b"n" * 12, b"c" * 10, b"n" * 12, b"c" * 10)
+        await db.insert_entry_terms((eid, h) for h in (b"g1", b"g2"))
+        await db.insert_entry_terms(iter(()))
+        assert await db.get_entry_ids_for_all_terms([b"g1", b"g2"]) == [eid]
+
+    async def test_iter_entry_rows_batches(self, fresh_db):
+        await db.insert_user(
+            "user5i", "h", b"s" * 16, b"w" * 16, b"n" * 12,
+            "q", "a", "2024-01-01T00:00:00",
+        )
+        uid = (await db.get_user_by_username("user5i"))["id"]
+        ids = [
+            await db.insert_entry_row(uid, "2024-01-01", b"n" * 12, b"c" * 10, b"n" * 12, b"c" * 10)
+            for _ in range(5)
+        ]
+        batches = [[r["id"] for r in b] async for b in db.iter_entry_rows_for_user(uid, chunk=2)]
+        assert batches == [ids[0:2], ids[2:4], ids[4:5]]
+
+    async def test_insert_entry_with_terms(self, fresh_db):
+        await db.insert_user(
+            "user5b", "h", b"s" * 16, b"w" * 16, b"n" * 12,
+            "q", "a", "2024-01-01T00:00:00",
+        )
+        row = await db.get_user_by_username("user5b")
+        uid = row["id"]
+
+        eid = await db.insert_entry_with_terms(
+            uid, "2024-01-01", b"n" * 12, b"c" * 10, b"n" * 12, b"c" * 10,
+            None, None, "ascii", [b"h1", b"h2"], word_count=7,
+        )
+        assert eid in await db.get_entry_ids_for_term(b"h1")
+        assert eid in await db.get_entry_ids_for_term(b"h2")
+        full = await db.get_entry_row_full(uid, eid)
+        assert full["word_count"] == 7
+
+    async def test_update_entry_with_terms(self, fresh_db):
+        await db.insert_user(
+            "user5d", "h", b"s" * 16, b"w" * 16, b"n" * 12,
+            "q", "a", "2024-01-01T00:00:00",
+        )
+        uid = (await db.get_user_by_username("user5d"))["id"]
+        eid = await db.insert_entry_with_terms(
+            uid, "2024-01-01", b"n" * 12, b"c" * 10, b"n" * 12, b"c" * 10,
+            None, None, "ascii", [b"old"],
+        )
+        await db.update_entry_with_terms(
+            eid, uid, b"n" * 12, b"t" * 10, b"n" * 12, b"b" * 10,
+            None, None, "ascii", iter([b"new"]), word_count=3,
+        )
+        assert await db.get_entry_ids_for_term(b"old") == []
+        assert await db.get_entry_ids_for_term(b"new") == [eid]
+        full = await db.get_entry_row_full(uid, eid)
+        assert full["title_ct"] == b"t" * 10
+        assert full["word_count"] == 3
+
+        # Another user's id must not touch the entry or its index
+        await db.update_entry_with_terms(
+            eid, uid + 1, b"n" * 12, b"x" * 10, b"n" * 12, b"x" * 10,
+            None, None, "ascii", [b"evil"],
+        )
+        assert await db.get_entry_ids_for_term(b"new") == [eid]
+        assert await db.get_entry_ids_for_term(b"evil") == []
+
+    async def test_all_terms_is_and(self, fresh_db):
+        await db.insert_user(
+            "user5c", "h", b"s" * 16, b"w" * 16, b"n" * 12,
+            "q", "a", "2024-01-01T00:00:00",
+        )
+        uid = (await db.get_user_by_username("user5c"))["id"]
+        e1 = await db.insert_entry_row(uid, "2024-01-01", b"n" * 12, b"c" * 10, b"n" * 12, b"c" * 10)
+        e2 = await db.insert_entry_row(uid, "2024-01-02", b"n" * 12, b"c" * 10, b"n" * 12, b"c" * 10)
+        await db.insert_entry_terms([(e1, b"a"), (e1, b"b"), (e2, b"a")])
+
+        assert await db.get_entry_ids_for_all_terms([b"a"]) == [e2, e1]
+        assert await db.get_entry_ids_for_all_terms([b"a", b"b"]) == [e1]
+        assert await db.get_entry_ids_for_all_terms([b"a", b"missing"]) == []
+        assert await db.get_entry_ids_for_all_terms([]) == []
+
     async def test_clear_terms(self, fresh_db):
         await db.insert_user(
             "user6", "h", b"s" * 16, b"w" * 16, b"n" * 12,
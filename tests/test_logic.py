@@ -34,6 +34,87 @@ class TestAuth:
         q = await logic.get_security_question("dave")
         assert q == "What pet?"
 
+    async def test_change_password(self, fresh_db):
+        await logic.register_user("frank", "oldpass", "q?", "a")
+        sess = await logic.login_user("frank", "oldpass")
+        eid = await logic.add_entry(sess, "Secret Title", "hidden body words", mood="calm")
+        await logic.add_entry(sess, "Other", "unrelated")
+        nb_id = await logic.create_notebook(sess, "Work")
+        tpl_id = await logic.create_template(sess, "daily", "Tpl title", "Tpl body")
+        await logic.save_draft(sess, "Draft title", "Draft body")
+        await logic.add_tag(sess, eid, "Travel")
+
+        new_sess = await logic.change_password_logged_in(sess, "oldpass", "newpass")
+        with pytest.raises(ValueError):
+            await logic.login_user("frank", "oldpass")
+        sess2 = await logic.login_user("frank", "newpass")
+        assert sess2.dek == new_sess.dek
+        entry = await logic.get_entry_full(sess2, eid)
+        assert entry["title"] == "Secret Title"
+        assert entry["mood"] == "calm"
+        assert await logic.search_entries(sess2, "hidden words") == [eid]
+        assert await logic.list_notebooks(sess2) == [(nb_id, "Work")]
+        assert await logic.get_template(sess2, tpl_id) == ("daily", "Tpl title", "Tpl body")
+        assert await logic.get_draft(sess2) == ("Draft title", "Draft body")
+        assert await logic.search_by_tag(sess2, "travel") == [eid]
+
+    async def test_change_password_keeps_chacha_maps(self, fresh_db, monkeypatch):
+        await logic.register_user("hank", "oldpass", "q?", "a")
+        sess = await logic.login_user("hank", "oldpass")
+        monkeypatch.setattr(logic, "has_aes_acceleration", lambda: False)
+        eid = await logic.add_entry(sess, "Map", "a body long enough for a map")
+        before = (await logic.get_entry_with_map(sess, eid))[3]
+        new_sess = await logic.change_password_logged_in(sess, "oldpass", "newpass")
+        row = await logic.db.get_entry_row_full(new_sess.user_id, eid)
+        assert row["map_format"] == "chacha20-ascii"
+        assert (await logic.get_entry_with_map(new_sess, eid))[3] == before
+
+    async def test_change_password_reuses_cipher_contexts(self, fresh_db, monkeypatch):
+        from cyberjournal import crypto
+        await logic.register_user("gina", "oldpass", "q?", "a")
+        sess = await logic.login_user("gina", "oldpass")
+        for i in range(5):
+            await logic.add_entry(sess, f"Title {i}", f"body {i}", mood="ok")
+        built = []
+        real = crypto.AESGCM
+        monkeypatch.setattr(crypto, "AESGCM", lambda key: built.append(key) or real(key))
+        await logic.change_password_logged_in(sess, "oldpass", "newpass")
+        # DEK wrap + new session cipher; nothing per entry
+        assert len(built) == 2
+
+    async def test_legacy_scrypt_user_upgraded_on_login(self, fresh_db):
+        import secrets
+        from cyberjournal import db
+        from cyberjournal.crypto import (
+            PH, KDF_VERSION_CURRENT, scrypt_kdf, hkdf_derive, aesgcm_encrypt,
+        )
+        dek = secrets.token_bytes(32)
+        salt = secrets.token_bytes(16)
+        wrap_key = hkdf_derive(scrypt_kdf("oldpw", salt, 32), b"wrap-key", 32)
+        nonce, wrapped = aesgcm_encrypt(wrap_key, dek, aad=b"legacy")
+        await db.insert_user(
+            "legacy", PH.hash("oldpw"), salt, wrapped, nonce,
+            "q?", PH.hash("a"), "2024-01-01T00:00:00", kek_version=1,
+        )
+
+        sess = await logic.login_user("legacy", "oldpw")
+        assert sess.dek == dek
+        row = await db.get_user_by_username("legacy")
+        assert row["kek_version"] == KDF_VERSION_CURRENT
+        sess2 = await logic.login_user("legacy", "oldpw")
+        assert sess2.dek == dek
+
+    async def test_wrong_password_skips_kek_derivation(self, fresh_db, monkeypatch):
+        await logic.register_user("frank", "pw", "q?", "a")
+        calls = []
+        derive = logic.derive_kek
+        monkeypatch.setattr(logic, "derive_kek", lambda *a: calls.append(a) or derive(*a))
+        with pytest.raises(ValueError):
+            await logic.login_user("frank", "wrong")
+        assert calls == []
+        await logic.login_user("frank", "pw")
+        assert len(calls) == 1
+
     async def test_password_reset(self, fresh_db):
         await logic.register_user("eve", "oldpass", "num?", "42")
         sess = await logic.login_user("eve", "oldpass")
@@ -53,6 +134,16 @@ class TestEntries:
         assert entries[0][0] == eid
         assert entries[0][2] == "My Title"
 
+    async def test_reads_reuse_session_cipher(self, test_user, monkeypatch):
+        from cyberjournal import crypto
+        for i in range(3):
+            await logic.add_entry(test_user, f"T{i}", f"body {i}")
+        built = []
+        monkeypatch.setattr(crypto, "AESGCM", lambda key: built.append(key))
+        entries = await logic.list_entries(test_user)
+        await logic.get_entry_full(test_user, entries[0][0])
+        assert built == []
+
     async def test_get_entry(self, test_user):
         eid = await logic.add_entry(test_user, "Title", "Body content")
         created_at, title, body = await logic.get_entry(test_user, eid)
@@ -82,6 +173,43 @@ class TestEntries:
         assert title == "Map Test"
         assert map_text  # should have generated a map
 
+    async def test_map_render_cached(self, test_user, monkeypatch):
+        calls = []
+        render = logic._render_entry_map_text
+        monkeypatch.setattr(logic, "_render_entry_map_text", lambda *a, **kw: calls.append(a) or render(*a, **kw))
+        logic._MAP_CACHE.clear()
+        e1 = await logic.add_entry(test_user, "Same", "unchanged body")
+        e2 = await logic.add_entry(test_user, "Same", "unchanged body")
+        await logic.update_entry(test_user, e1, "Same", "unchanged body")
+        assert len(calls) == 1
+        m1 = (await logic.get_entry_with_map(test_user, e1))[3]
+        m2 = (await logic.get_entry_with_map(test_user, e2))[3]
+        assert m1 == m2
+
+    async def test_map_cache_per_user_and_cleared(self, test_user, monkeypatch):
+        calls = []
+        render = logic._render_entry_map_text
+        monkeypatch.setattr(logic, "_render_entry_map_text", lambda *a, **kw: calls.append(a) or render(*a, **kw))
+        logic.clear_map_cache()
+        await logic.register_user("other", "otherpass", "q", "a")
+        other = await logic.login_user("other", "otherpass")
+        await logic.add_entry(test_user, "Same", "shared body")
+        await logic.add_entry(other, "Same", "shared body")
+        assert len(calls) == 2
+        await logic.change_password_logged_in(other, "otherpass", "newpass")
+        assert not logic._MAP_CACHE
+
+    async def test_map_chacha_without_aes_hw(self, test_user, monkeypatch):
+        aes_eid = await logic.add_entry(test_user, "AES", "map body text")
+        monkeypatch.setattr(logic, "has_aes_acceleration", lambda: False)
+        eid = await logic.add_entry(test_user, "Map Test", "A long body with many words for the map generator")
+        row = await logic.db.get_entry_row_full(test_user.user_id, eid)
+        assert row["map_format"] == "chacha20-ascii"
+        *_, map_text, map_fmt = await logic.get_entry_with_map(test_user, eid)
+        assert map_text and map_fmt == "ascii"
+        # Rows written with AES-GCM stay readable
+        assert (await logic.get_entry_full(test_user, aes_eid))["map_text"]
+
     async def test_entry_with_mood_weather(self, test_user):
         eid = await logic.add_entry(test_user, "Mood", "Body", mood="happy", weather="sunny")
         entry = await logic.get_entry_full(test_user, eid)
@@ -107,6 +235,13 @@ class TestSearch:
         results = await logic.search_entries(test_user, "python flask")
         assert len(results) == 1
 
+    async def test_list_entries_by_ids(self, test_user):
+        e1 = await logic.add_entry(test_user, "First", "body one")
+        e2 = await logic.add_entry(test_user, "Second", "body two")
+        rows = await logic.list_entries_by_ids(test_user, [e2, 99999, e1])
+        assert [(r[0], r[2]) for r in rows] == [(e2, "Second"), (e1, "First")]
+        assert await logic.list_entries_by_ids(test_user, []) == []
+
     async def test_empty_search(self, test_user):
         results = await logic.search_entries(test_user, "")
         assert results == []
@@ -232,3 +367,55 @@ class TestPagination:
 
         page3 = await logic.list_entries_paginated(test_user, limit=10, offset=20)
         assert len(page3) == 5
+
+    async def test_paginated_decrypts_title_and_mood(self, test_user):
+        e1 = await logic.add_entry(test_user, "Calm day", "Body", mood="calm")
+        e2 = await logic.add_entry(test_user, "No mood", "Body")
+        page = await logic.list_entries_paginated(test_user, sort_asc=True)
+        assert [(eid, title, mood) for eid, _, title, _, _, mood in page] == [
+            (e1, "Calm day", "calm"),
+            (e2, "No mood", ""),
+        ]
+
+
+class TestConfig:
+    def test_defaults_written_and_copied(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        cfg = logic.load_config()
+        assert cfg == logic.DEFAULT_CONFIG
+        cfg["active_theme"] = "changed"
+        assert logic.DEFAULT_CONFIG["active_theme"] != "changed"
+        assert (tmp_path / "cyberjournal" / "config.json").exists()
+
+    def test_file_values_merged(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        logic.save_config({"active_theme": "amber"})
+        cfg = logic.load_config()
+        assert cfg["active_theme"] == "amber"
+        assert cfg["ascii_art_enabled"] is logic.DEFAULT_CONFIG["ascii_art_enabled"]
+
+    def test_save_replaces_without_temp_leftover(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        logic.save_config({"active_theme": "one"})
+        logic.save_config({"active_theme": "two"})
+        assert logic.load_config()["active_theme"] == "two"
+        assert [p.name for p in (tmp_path / "cyberjournal").iterdir()] == ["config.json"]
+
+    def test_load_cached_until_file_changes(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+        logic.save_config({"active_theme": "one"})
+        calls = []
+        real_load = logic.json.load
+        monkeypatch.setattr(logic.json, "load", lambda f: calls.append(f) or real_load(f))
+        logic.load_config()["active_theme"] = "mutated"
+        assert logic.load_config()["active_theme"] == "one"
+        assert calls == []
+        (tmp_path / "cyberjournal" / "config.json").write_text('{"active_theme": "edited"}')
+        assert logic.load_config()["active_theme"] == "edited"
+        assert len(calls) == 1
+
+    def test_config_flag_parses_strings(self):
+        assert logic.config_flag({"ascii_art_enabled": "false"}, "ascii_art_enabled") is False
+        assert logic.config_flag({"ascii_art_enabled": " Yes "}, "ascii_art_enabled") is True
+        assert logic.config_flag({"ascii_art_enabled": 0}, "ascii_art_enabled") is False
+        assert logic.config_flag({}, "ascii_art_enabled") is True
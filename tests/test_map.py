@@ -8,9 +8,13 @@ from cyberjournal.map import (
     render_ascii,
     render_colored_map,
     classify,
+    classify_field,
     top_keywords,
     rand01,
+    lattice01,
     noise,
+    noise_field,
+    terrain_fields,
 )
 
 
@@ -31,6 +35,16 @@ class TestRand01:
     def test_deterministic(self):
         assert rand01(42, 1, 2) == rand01(42, 1, 2)
 
+    def test_negative_coords(self):
+        assert 0.0 <= rand01(42, -5, -1_000_000) < 1.0
+        assert rand01(42, -1, 0) != rand01(42, 1, 0)
+
+    def test_lattice_range_and_spread(self):
+        vals = [lattice01(42, x, y) for x in range(-20, 20) for y in range(-20, 20)]
+        assert all(0.0 <= v < 1.0 for v in vals)
+        assert len(set(vals)) == len(vals)
+        assert 0.4 < sum(vals) / len(vals) < 0.6
+
 
 class TestNoise:
     def test_range(self):
@@ -42,6 +56,16 @@ class TestNoise:
     def test_deterministic(self):
         assert noise(42, 5.0, 5.0) == noise(42, 5.0, 5.0)
 
+    def test_field_matches_per_cell(self):
+        field = noise_field(42, 13, 9, scale=5.3, octaves=4, persistence=0.55, x_off=1000, y_off=-777)
+        assert len(field) == 9 and len(field[0]) == 13
+        for y in range(9):
+            for x in range(13):
+                assert field[y][x] == noise(42, x + 1000, y - 777, scale=5.3, octaves=4, persistence=0.55)
+
+    def test_field_empty(self):
+        assert noise_field(42, 0, 3) == [[], [], []]
+
 
 class TestClassify:
     def test_water(self):
@@ -59,6 +83,14 @@ class TestClassify:
     def test_forest(self):
         assert classify(0.5, 0.8) == "forest"
 
+    def test_field_matches_per_cell(self):
+        elev = [[0.1, 0.3, 0.9], [0.7, 0.7, 0.5]]
+        moist = [[0.5, 0.5, 0.5], [0.3, 0.8, 0.8]]
+        assert classify_field(elev, moist) == [
+            ["water", "shore", "mount"],
+            ["hill", "forest", "forest"],
+        ]
+
 
 class TestTopKeywords:
     def test_basic(self):
@@ -96,6 +128,11 @@ class TestTextToMap:
         _, t2, _, _ = text_to_map("delta epsilon zeta")
         assert t1 != t2
 
+    def test_precomputed_fields(self):
+        text = "shared fields text"
+        fields = terrain_fields(text_seed(text), 20, 10)
+        assert text_to_map(text, 20, 10, fields=fields) == text_to_map(text, 20, 10)
+
     def test_seed_diversity(self):
         """Verify the wider modulus fix gives more distinct scale pairs."""
         seeds = set()
@@ -128,3 +165,7 @@ class TestRenderers:
         assert isinstance(output, str)
         # No ANSI codes
         assert "\x1b[" not in output
+
+    def test_render_unknown_tile(self):
+        output = render_colored_map([["field", "bogus"]], charset="ascii", color=True, border=False)
+        assert output == "\x1b[32m.\x1b[0m\x1b[37m?\x1b[0m"
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Tests for the Textual screens (run headless)."""
+from __future__ import annotations
+
+import pytest
+
+from cyberjournal import logic
+from cyberjournal.ui import PAGE_SIZE, CyberJournalApp, EntryItem, JournalHomeScreen, ViewEntryScreen
+
+
+@pytest.fixture(autouse=True)
+def config_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+
+
+def _shown(home: JournalHomeScreen) -> list[int]:
+    return [item.eid for item in home.list_view.children if isinstance(item, EntryItem)]
+
+
+class TestHomeScreen:
+    async def _home_with_full_page(self, app, pilot, sess) -> JournalHomeScreen:
+        for i in range(PAGE_SIZE + 2):
+            await logic.add_entry(sess, f"Entry {i}", f"Body {i}")
+        app.session = sess
+        home = JournalHomeScreen()
+        await app.push_screen(home)
+        await pilot.pause()
+        return home
+
+    async def test_remove_entry_backfills_full_page(self, test_user):
+        app = CyberJournalApp()
+        async with app.run_test() as pilot:
+            home = await self._home_with_full_page(app, pilot, test_user)
+            victim = home.list_view.children[3].eid
+            await logic.delete_entry(test_user, victim)
+            await home.remove_entry(victim)
+            expected = [row[0] for row in await logic.list_entries_paginated(test_user, limit=PAGE_SIZE)]
+            assert _shown(home) == expected
+
+            # Resuming keeps the patched page rather than re-querying it
+            await app.push_screen(ViewEntryScreen(entry_id=expected[0]))
+            await pilot.pause()
+            app.pop_screen()
+            await pilot.pause()
+            assert app.screen is home
+            assert _shown(home) == expected
+
+    async def test_delete_from_entry_view_then_resume(self, test_user):
+        app = CyberJournalApp()
+        async with app.run_test() as pilot:
+            home = await self._home_with_full_page(app, pilot, test_user)
+            victim = home.list_view.children[0].eid
+            home.list_view.index = 0
+            home.list_view.action_select_cursor()
+            await pilot.pause()
+            assert isinstance(app.screen, ViewEntryScreen)
+
+            await logic.delete_entry(test_user, victim)
+            app.screen.dismiss("deleted")
+            await pilot.pause()
+
+            assert app.screen is home
+            shown = _shown(home)
+            expected = await logic.list_entries_paginated(test_user, limit=PAGE_SIZE)
+            assert shown == [row[0] for row in expected]
+            assert victim not in shown